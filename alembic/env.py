@@ -0,0 +1,98 @@
+"""
+Entorno de Alembic.
+
+Se puede ejecutar desde la línea de comandos (`alembic upgrade head`), que usa
+el engine asíncrono con DATABASE_URL, o desde init_db(), que pasa su propia
+conexión en config.attributes["connection"]. En producción conviene lo primero
+como paso de despliegue, con DB_RUN_MIGRATIONS=false en la aplicación.
+"""
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.database.session import Base, async_database_url
+from app.models import tournament  # noqa: F401  (registra los modelos en Base.metadata)
+
+config = context.config
+
+if config.config_file_name is not None and "connection" not in config.attributes:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+# Lock para que varias réplicas que arrancan a la vez no migren en paralelo
+MIGRATION_LOCK_ID = 73112024
+
+
+def run_migrations_offline() -> None:
+    """Genera el SQL de las migraciones sin conectarse (alembic upgrade --sql)"""
+    context.configure(
+        url=async_database_url(settings.DATABASE_URL),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    """
+    Aplica las migraciones pendientes sobre una conexión síncrona (sin
+    transacción abierta).
+
+    Cada revisión corre en su propia transacción y las que crean índices con
+    CONCURRENTLY usan autocommit_block(), que confirma la transacción en
+    curso: por eso el lock es de sesión y no de transacción.
+    """
+    is_postgresql = connection.dialect.name == "postgresql"
+    if is_postgresql:
+        connection.execute(text("SELECT pg_advisory_lock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID})
+        connection.commit()
+
+    try:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+    finally:
+        if is_postgresql:
+            connection.rollback()
+            connection.execute(text("SELECT pg_advisory_unlock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID})
+            connection.commit()
+
+
+async def run_async_migrations() -> None:
+    """Crea un engine asíncrono y aplica las migraciones"""
+    connectable = create_async_engine(async_database_url(settings.DATABASE_URL))
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    """Aplica las migraciones con la conexión de init_db() o con un engine propio"""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+    else:
+        asyncio.run(run_async_migrations())
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
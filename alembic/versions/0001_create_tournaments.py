@@ -0,0 +1,57 @@
+"""Tabla de torneos (esquema inicial)
+
+Las bases creadas antes de Alembic con create_all ya tienen la tabla: en ese
+caso esta revisión no hace nada y solo se registra como aplicada.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-01-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TOURNAMENT_TYPES = ("INDIVIDUAL", "TEAM")
+TOURNAMENT_STATUSES = ("PENDING", "REGISTRATION", "IN_PROGRESS", "COMPLETED", "CANCELLED")
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("tournaments"):
+        return
+
+    op.create_table(
+        "tournaments",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("game", sa.String(100), nullable=False),
+        sa.Column("description", sa.String(1000), nullable=True),
+        sa.Column("max_participants", sa.Integer(), nullable=False),
+        sa.Column("current_participants", sa.Integer(), nullable=False),
+        sa.Column("tournament_type", sa.Enum(*TOURNAMENT_TYPES, name="tournamenttype"), nullable=False),
+        sa.Column("status", sa.Enum(*TOURNAMENT_STATUSES, name="tournamentstatus"), nullable=False),
+        sa.Column("registration_start", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("registration_end", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("tournament_start", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("tournament_end", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_tournaments_id", "tournaments", ["id"])
+    op.create_index("ix_tournaments_name", "tournaments", ["name"])
+    op.create_index("ix_tournaments_game", "tournaments", ["game"])
+    op.create_index("ix_tournaments_tournament_type", "tournaments", ["tournament_type"])
+    op.create_index("ix_tournaments_status", "tournaments", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_table("tournaments")
+    sa.Enum(name="tournamentstatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="tournamenttype").drop(op.get_bind(), checkfirst=True)
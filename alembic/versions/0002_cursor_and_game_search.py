@@ -0,0 +1,162 @@
+"""Paginación por cursor y búsqueda por juego
+
+- Índice (created_at, id) para el orden del listado y la paginación por cursor
+- Columna game_slug (juego normalizado) para búsquedas exactas
+- Índice GIN pg_trgm sobre game para ILIKE '%...%' (reemplaza al B-tree)
+
+En PostgreSQL no bloquea las escrituras: el backfill va por lotes, los índices
+se crean y eliminan con CONCURRENTLY (fuera de transacción, en
+autocommit_block) y el NOT NULL se apoya en un CHECK validado aparte.
+Un trigger calcula game_slug en la base, así que las instancias con la versión
+anterior (que no lo envían) siguen insertando durante el despliegue.
+Cada paso se puede repetir si una ejecución anterior falló a mitad de camino.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-01-20
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _slugify_game(game: str) -> str:
+    """Copia de app.models.tournament.slugify_game al momento de esta revisión"""
+    return re.sub(r"[^a-z0-9]+", "-", game.lower()).strip("-")
+
+
+# Filas por UPDATE del backfill (cada lote se confirma por separado)
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _backfill_game_slug(bind) -> None:
+    """Calcula game_slug de los torneos existentes"""
+    if bind.dialect.name == "postgresql":
+        backfill = (
+            "UPDATE tournaments "
+            "SET game_slug = btrim(regexp_replace(lower(game), '[^a-z0-9]+', '-', 'g'), '-')"
+        )
+        if op.get_context().as_sql:
+            # alembic upgrade --sql: no hay filas que contar, un solo UPDATE
+            op.execute(backfill)
+            return
+        # Lotes cortos: cada UPDATE bloquea solo sus filas y se confirma enseguida
+        batch = sa.text(
+            backfill + " WHERE id IN (SELECT id FROM tournaments WHERE game_slug IS NULL LIMIT :batch_size)"
+        )
+        while bind.execute(batch, {"batch_size": BACKFILL_BATCH_SIZE}).rowcount:
+            pass
+        return
+
+    tournaments = sa.table(
+        "tournaments",
+        sa.column("id", sa.Integer),
+        sa.column("game", sa.String),
+        sa.column("game_slug", sa.String)
+    )
+    for tournament_id, game in bind.execute(sa.select(tournaments.c.id, tournaments.c.game)).all():
+        bind.execute(
+            tournaments.update().where(tournaments.c.id == tournament_id).values(game_slug=_slugify_game(game))
+        )
+
+
+def _drop_invalid_index(name: str) -> None:
+    """Elimina el índice que dejó INVALID un CREATE INDEX CONCURRENTLY fallido"""
+    if op.get_context().as_sql:
+        return
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name AND NOT i.indisvalid"
+    ), {"name": name}).first()
+    if invalid:
+        op.drop_index(name, table_name="tournaments", postgresql_concurrently=True)
+
+
+def _create_index_concurrently(name: str, columns: list, **kw) -> None:
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS, descartando antes un intento fallido"""
+    _drop_invalid_index(name)
+    op.create_index(name, "tournaments", columns, postgresql_concurrently=True, if_not_exists=True, **kw)
+
+
+def _upgrade_postgresql() -> None:
+    """Pasos de PostgreSQL (cada uno se puede repetir)"""
+    op.execute("ALTER TABLE tournaments ADD COLUMN IF NOT EXISTS game_slug VARCHAR(100)")
+    # Misma normalización que slugify_game, calculada por la base en cada
+    # INSERT o cambio de game (también para las instancias que no lo envían)
+    op.execute(
+        "CREATE OR REPLACE FUNCTION tournaments_set_game_slug() RETURNS trigger AS $$ "
+        "BEGIN "
+        "NEW.game_slug := btrim(regexp_replace(lower(NEW.game), '[^a-z0-9]+', '-', 'g'), '-'); "
+        "RETURN NEW; "
+        "END $$ LANGUAGE plpgsql"
+    )
+    op.execute("DROP TRIGGER IF EXISTS tournaments_game_slug ON tournaments")
+    op.execute(
+        "CREATE TRIGGER tournaments_game_slug BEFORE INSERT OR UPDATE OF game ON tournaments "
+        "FOR EACH ROW EXECUTE FUNCTION tournaments_set_game_slug()"
+    )
+
+    # Desde aquí cada sentencia se confirma por separado (autocommit)
+    with op.get_context().autocommit_block():
+        _backfill_game_slug(op.get_bind())
+
+        # SET NOT NULL no recorre la tabla si un CHECK validado ya lo garantiza;
+        # VALIDATE recorre la tabla sin bloquear las escrituras
+        op.execute("ALTER TABLE tournaments DROP CONSTRAINT IF EXISTS tournaments_game_slug_not_null")
+        op.execute(
+            "ALTER TABLE tournaments ADD CONSTRAINT tournaments_game_slug_not_null "
+            "CHECK (game_slug IS NOT NULL) NOT VALID"
+        )
+        op.execute("ALTER TABLE tournaments VALIDATE CONSTRAINT tournaments_game_slug_not_null")
+        op.alter_column("tournaments", "game_slug", existing_type=sa.String(100), nullable=False)
+        op.execute("ALTER TABLE tournaments DROP CONSTRAINT tournaments_game_slug_not_null")
+
+        _create_index_concurrently("ix_tournaments_created_at_id", ["created_at", "id"])
+        _create_index_concurrently("ix_tournaments_game_slug", ["game_slug"])
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        _create_index_concurrently(
+            "ix_tournaments_game_trgm",
+            ["game"],
+            postgresql_using="gin",
+            postgresql_ops={"game": "gin_trgm_ops"}
+        )
+        op.drop_index(
+            "ix_tournaments_game", table_name="tournaments",
+            postgresql_concurrently=True, if_exists=True
+        )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    if bind.dialect.name == "postgresql":
+        _upgrade_postgresql()
+        return
+
+    op.add_column("tournaments", sa.Column("game_slug", sa.String(100), nullable=True))
+    op.create_index("ix_tournaments_created_at_id", "tournaments", ["created_at", "id"])
+    _backfill_game_slug(bind)
+    with op.batch_alter_table("tournaments") as batch_op:
+        batch_op.alter_column("game_slug", existing_type=sa.String(100), nullable=False)
+    op.create_index("ix_tournaments_game_slug", "tournaments", ["game_slug"])
+    op.drop_index("ix_tournaments_game", table_name="tournaments")
+
+
+def downgrade() -> None:
+    op.create_index("ix_tournaments_game", "tournaments", ["game"])
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS tournaments_game_slug ON tournaments")
+        op.execute("DROP FUNCTION IF EXISTS tournaments_set_game_slug()")
+        op.drop_index("ix_tournaments_game_trgm", table_name="tournaments")
+    op.drop_index("ix_tournaments_game_slug", table_name="tournaments")
+    with op.batch_alter_table("tournaments") as batch_op:
+        batch_op.drop_column("game_slug")
+    op.drop_index("ix_tournaments_created_at_id", table_name="tournaments")
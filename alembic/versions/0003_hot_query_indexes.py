@@ -0,0 +1,81 @@
+"""Índices compuestos para las consultas frecuentes
+
+- (status, created_at DESC, id DESC): listado filtrado por estado
+- (game_slug, status, created_at DESC, id DESC): listado por juego exacto
+  (con o sin estado)
+- (created_at DESC, id DESC) WHERE status IN (registration, in_progress):
+  torneos activos (precarga del caché)
+
+Los índices de una sola columna sobre status y game_slug quedan cubiertos
+por los compuestos (son su prefijo) y se eliminan.
+La verificación de planes está en tests/check_query_plans.py.
+
+Los índices se crean y eliminan con CONCURRENTLY (en PostgreSQL, fuera de
+transacción con autocommit_block) para no bloquear las escrituras. Cada paso
+se puede repetir si una ejecución anterior falló a mitad de camino.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-01-27
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_index_concurrently(name: str, columns: list, **kw) -> None:
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS. En PostgreSQL descarta antes el
+    índice que haya dejado INVALID un intento fallido.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql" and not op.get_context().as_sql:
+        invalid = bind.execute(sa.text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ), {"name": name}).first()
+        if invalid:
+            op.drop_index(name, table_name="tournaments", postgresql_concurrently=True)
+    op.create_index(name, "tournaments", columns, postgresql_concurrently=True, if_not_exists=True, **kw)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        _create_index_concurrently(
+            "ix_tournaments_status_created_at",
+            ["status", sa.text("created_at DESC"), sa.text("id DESC")]
+        )
+        _create_index_concurrently(
+            "ix_tournaments_game_slug_status_created_at",
+            ["game_slug", "status", sa.text("created_at DESC"), sa.text("id DESC")]
+        )
+        _create_index_concurrently(
+            "ix_tournaments_active_created_at",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_where=sa.text("status IN ('REGISTRATION', 'IN_PROGRESS')")
+        )
+
+        op.drop_index(
+            "ix_tournaments_status", table_name="tournaments",
+            postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            "ix_tournaments_game_slug", table_name="tournaments",
+            postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    op.create_index("ix_tournaments_game_slug", "tournaments", ["game_slug"])
+    op.create_index("ix_tournaments_status", "tournaments", ["status"])
+
+    op.drop_index("ix_tournaments_active_created_at", table_name="tournaments")
+    op.drop_index("ix_tournaments_game_slug_status_created_at", table_name="tournaments")
+    op.drop_index("ix_tournaments_status_created_at", table_name="tournaments")
@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, Query, status, HTTPException
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, List, Optional
+import json
 import math
 
 from app.database.session import get_db
+from app.database.replica import get_read_db
 from app.schemas.tournament import (
     TournamentCreate,
     TournamentUpdate,
     TournamentResponse,
     TournamentListResponse,
+    TournamentBatchItem,
+    TournamentBatchResponse,
+    TournamentBulkItem,
+    TournamentBulkResponse,
     StartTournamentRequest,
     BracketInfoResponse
 )
@@ -21,11 +28,16 @@ router = APIRouter(
     tags=["Tournaments"]
 )
 
+MAX_BATCH_SIZE = 100  # Máximo de IDs por consulta en /batch
+MAX_BULK_SIZE = 1000  # Máximo de torneos por creación masiva en /bulk
+MAX_BULK_BODY_BYTES = MAX_BULK_SIZE * 4096  # Cuerpo máximo de /bulk (holgado para torneos con todos los campos)
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
 
 @router.post("/", response_model=TournamentResponse, status_code=status.HTTP_201_CREATED)
 async def create_tournament(
     tournament: TournamentCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Crea un nuevo torneo.
@@ -44,53 +56,264 @@ async def create_tournament(
     return await TournamentService.create_tournament_async(db, tournament)
 
 
+async def _read_bulk_body(request: Request) -> AsyncIterator[bytes]:
+    """
+    Lee el cuerpo de /bulk por partes y corta con 413 apenas supera
+    MAX_BULK_BODY_BYTES: un cuerpo enorme no llega a guardarse ni a parsearse.
+    Content-Length se revisa antes de leer; el conteo cubre los envíos
+    chunked o con un Content-Length falso.
+    """
+    def too_large():
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"El cuerpo supera el máximo de {MAX_BULK_BODY_BYTES} bytes por lote"
+        )
+    
+    try:
+        content_length = int(request.headers.get("content-length", 0))
+    except ValueError:
+        content_length = 0
+    if content_length > MAX_BULK_BODY_BYTES:
+        raise too_large()
+    
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > MAX_BULK_BODY_BYTES:
+            raise too_large()
+        yield chunk
+
+
+async def _read_bulk_items(request: Request) -> List[Any]:
+    """
+    Lee el cuerpo de /bulk: un array JSON o NDJSON (un torneo por línea).
+    En NDJSON se procesa a medida que llega y una línea inválida queda como
+    error de ese elemento (None) sin descartar las demás.
+    En ambos casos el tamaño del cuerpo se limita antes de parsear.
+    """
+    def too_many():
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Se permiten como máximo {MAX_BULK_SIZE} torneos por lote"
+        )
+    
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    
+    if content_type in NDJSON_CONTENT_TYPES:
+        items = []
+        buffer = b""
+        
+        def add_line(line: bytes):
+            if not line.strip():
+                return
+            if len(items) >= MAX_BULK_SIZE:
+                raise too_many()
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(None)
+        
+        async for chunk in _read_bulk_body(request):
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                add_line(line)
+        add_line(buffer)
+        return items
+    
+    body = b"".join([chunk async for chunk in _read_bulk_body(request)])
+    try:
+        items = json.loads(body)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El cuerpo debe ser un array JSON o NDJSON (application/x-ndjson)"
+        )
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El cuerpo debe ser un array JSON de torneos"
+        )
+    if len(items) > MAX_BULK_SIZE:
+        raise too_many()
+    return items
+
+
+@router.post("/bulk", response_model=TournamentBulkResponse)
+async def create_tournaments_bulk(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Crea varios torneos en una sola operación.
+    
+    El cuerpo puede ser:
+    - un array JSON de torneos (`application/json`)
+    - NDJSON, un torneo por línea (`application/x-ndjson`)
+    
+    Cada torneo tiene los mismos campos que en `POST /tournaments/` (máx. 1000
+    por lote). Los válidos se insertan juntos en una sola transacción; los
+    inválidos se reportan en `results` con sus errores, en el orden recibido.
+    
+    **Publica eventos:** tournament.created (uno por torneo creado)
+    """
+    items = await _read_bulk_items(request)
+    
+    results: List[Optional[TournamentBulkItem]] = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        if item is None:
+            results[index] = TournamentBulkItem(index=index, created=False, errors=["JSON inválido"])
+            continue
+        try:
+            valid.append((index, TournamentCreate.model_validate(item)))
+        except ValidationError as e:
+            results[index] = TournamentBulkItem(
+                index=index,
+                created=False,
+                errors=[
+                    f"{'.'.join(str(part) for part in error['loc']) or 'torneo'}: {error['msg']}"
+                    for error in e.errors()
+                ]
+            )
+    
+    created = await TournamentService.create_tournaments_bulk_async(db, [data for _, data in valid])
+    for (index, _), tournament in zip(valid, created):
+        results[index] = TournamentBulkItem(index=index, created=True, tournament=tournament)
+    
+    return TournamentBulkResponse(
+        created=len(created),
+        failed=len(items) - len(created),
+        results=results
+    )
+
+
 @router.get("/", response_model=TournamentListResponse)
 async def get_tournaments(
     page: int = Query(1, ge=1, description="Número de página"),
     page_size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
     game: Optional[str] = Query(None, description="Filtrar por juego"),
+    game_exact: bool = Query(False, description="El juego debe coincidir exactamente (sin distinguir mayúsculas ni signos)"),
     status: Optional[TournamentStatus] = Query(None, description="Filtrar por estado"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (next_cursor de la respuesta anterior)"),
+    include_total: bool = Query(False, description="Calcular total y total_pages"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Lista todos los torneos con paginación y filtros opcionales.
     
     - **page**: Número de página (default: 1)
     - **page_size**: Cantidad de resultados por página (default: 10, máx: 100)
-    - **game**: Filtrar por nombre del juego
+    - **game**: Filtrar por nombre del juego (subcadena)
+    - **game_exact**: Si es true, `game` debe ser el juego completo (ej: "cs go" coincide con "CS:GO")
     - **status**: Filtrar por estado (pending, registration, in_progress, completed, cancelled)
+    - **cursor**: Si se indica, pagina por cursor en lugar de por número de página
+    - **include_total**: Calcula `total` y `total_pages` (default: false). Sin
+      filtros y con muchos torneos el total es una estimación (`total_exact: false`)
+    
+    Cada respuesta incluye `next_cursor` para pedir la página siguiente. En modo
+    cursor todas las páginas cuestan lo mismo y no se calculan `page`, `total`
+    ni `total_pages`.
+    
+    Este endpoint usa caché de Redis para mejorar el rendimiento.
     """
     skip = (page - 1) * page_size
     
-    tournaments, total = TournamentService.get_tournaments(
+    tournaments, total, total_exact, next_cursor = await TournamentService.get_tournaments_cached(
         db=db,
         skip=skip,
         limit=page_size,
         game=game,
-        status_filter=status
+        game_exact=game_exact,
+        status_filter=status,
+        cursor=cursor,
+        include_total=include_total
     )
     
+    # Se retornan diccionarios: FastAPI valida y serializa con
+    # TournamentListResponse una sola vez (un modelo se volvería a validar)
+    if cursor:
+        return {
+            "tournaments": tournaments,
+            "page_size": page_size,
+            "next_cursor": next_cursor
+        }
+    
+    if total is None:
+        return {
+            "tournaments": tournaments,
+            "page": page,
+            "page_size": page_size,
+            "next_cursor": next_cursor
+        }
+    
     total_pages = math.ceil(total / page_size) if total > 0 else 0
     
-    return TournamentListResponse(
-        tournaments=tournaments,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
+    return {
+        "tournaments": tournaments,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+        "total_exact": total_exact,
+        "next_cursor": next_cursor
+    }
+
+
+@router.get("/batch", response_model=TournamentBatchResponse)
+async def get_tournaments_batch(
+    ids: str = Query(..., description="IDs de torneos separados por coma (ej: 1,2,3)"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Obtiene varios torneos por ID en una sola llamada.
+    
+    - **ids**: IDs separados por coma (máx. 100)
+    
+    Los resultados se devuelven en el orden solicitado. Los IDs inexistentes
+    se marcan con `found: false`.
+    Este endpoint usa caché de Redis para mejorar el rendimiento.
+    """
+    try:
+        tournament_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Los IDs deben ser números enteros separados por coma"
+        )
+    
+    if not tournament_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Debe indicar al menos un ID"
+        )
+    
+    if len(tournament_ids) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Se permiten como máximo {MAX_BATCH_SIZE} IDs por consulta"
+        )
+    
+    results = await TournamentService.get_tournaments_batch(db, tournament_ids)
+    
+    return TournamentBatchResponse(
+        tournaments=[
+            TournamentBatchItem(id=tournament_id, found=data is not None, tournament=data)
+            for tournament_id, data in zip(tournament_ids, results)
+        ]
     )
 
 
 @router.get("/{tournament_id}", response_model=TournamentResponse)
 async def get_tournament(
     tournament_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Obtiene un torneo específico por su ID.
     Este endpoint usa caché de Redis para mejorar el rendimiento.
     """
-    tournament_data = TournamentService.get_tournament_cached(db, tournament_id)
+    tournament_data = await TournamentService.get_tournament_cached(db, tournament_id)
     return tournament_data
 
 
@@ -98,7 +321,7 @@ async def get_tournament(
 async def update_tournament(
     tournament_id: int,
     tournament: TournamentUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Actualiza un torneo existente.
@@ -114,7 +337,7 @@ async def update_tournament(
 async def change_tournament_status(
     tournament_id: int,
     new_status: TournamentStatus,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Cambia el estado de un torneo.
@@ -134,7 +357,7 @@ async def change_tournament_status(
 @router.delete("/{tournament_id}", status_code=status.HTTP_200_OK)
 async def delete_tournament(
     tournament_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Elimina un torneo.
@@ -148,7 +371,7 @@ async def delete_tournament(
 async def start_tournament(
     tournament_id: int,
     request: StartTournamentRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Inicia un torneo generando el bracket y creando las partidas.
@@ -166,7 +389,7 @@ async def start_tournament(
     4. Publica evento para que Matches Service cree las partidas
     """
     # Obtener torneo
-    tournament = TournamentService.get_tournament_by_id(db, tournament_id)
+    tournament = await TournamentService.get_tournament_by_id(db, tournament_id)
     
     # Validar que esté en estado registration
     if tournament.status != TournamentStatus.REGISTRATION:
@@ -209,9 +432,12 @@ async def start_tournament(
     # Generar bracket
     bracket_info = await BracketService.start_tournament(tournament, request.participant_ids)
 
-    # Actualizar número de participantes y cambiar estado a in_progress
-    tournament.current_participants = len(request.participant_ids)
-    db.commit()
-    await TournamentService.change_status_async(db, tournament_id, TournamentStatus.IN_PROGRESS)
+    # Actualizar número de participantes y cambiar estado a in_progress (un solo UPDATE)
+    await TournamentService.change_status_async(
+        db,
+        tournament_id,
+        TournamentStatus.IN_PROGRESS,
+        current_participants=len(request.participant_ids)
+    )
 
     return bracket_info
\ No newline at end of file
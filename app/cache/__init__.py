@@ -1,6 +1,22 @@
 """
 Configuración de Redis cache
 """
-from app.cache.redis_client import redis_client
+from app.cache.redis_client import redis_client, CircuitState
+from app.cache.local_cache import LocalCache
+from app.cache.tiered_cache import tiered_cache, TieredCache
+from app.cache.bloom_filter import tournament_bloom, BloomFilter
+from app.cache.policy import CachePolicy
+from app.cache.metrics import cache_metrics, CacheMetrics
 
-__all__ = ["redis_client"]
\ No newline at end of file
+__all__ = [
+    "redis_client",
+    "CircuitState",
+    "LocalCache",
+    "tiered_cache",
+    "TieredCache",
+    "tournament_bloom",
+    "BloomFilter",
+    "CachePolicy",
+    "cache_metrics",
+    "CacheMetrics",
+]
\ No newline at end of file
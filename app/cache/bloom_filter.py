@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import math
+from typing import Dict, Iterable, List
+from app.cache.redis_client import redis_client
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom sobre un bitmap de Redis (SETBIT/GETBIT), sin módulos extra.
+
+    El bit 0 indica que el filtro ya fue poblado. Mientras no lo esté (o si la clave
+    se pierde) el filtro responde "puede existir" para no producir falsos negativos.
+    Los elementos no se pueden quitar: los IDs eliminados siguen dando positivo y
+    se resuelven con el caché negativo.
+
+    Si falla agregar un elemento, el filtro ya no es confiable: se apaga el bit
+    de listo (y, hasta lograrlo, este proceso lo trata como no poblado) para que
+    la reconstrucción periódica lo vuelva a poblar. La reconstrucción completa
+    también cubre bits perdidos sin error visible (ej: Redis restaurado de un
+    snapshot viejo).
+    """
+
+    READY_BIT = 0
+
+    def __init__(self, key: str, capacity: int, error_rate: float, enabled: bool = True):
+        """
+        Args:
+            key: Clave del bitmap en Redis
+            capacity: Cantidad esperada de elementos
+            error_rate: Tasa de falsos positivos deseada (ej: 0.01)
+            enabled: Si es False, el filtro siempre responde "puede existir"
+        """
+        self.key = key
+        self.enabled = enabled
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.size / capacity * math.log(2)))
+
+        # Un add falló y el bit de listo aún no se pudo apagar
+        self.unreliable = False
+
+        # Estadísticas
+        self.rejections = 0
+        self.failed_adds = 0
+
+    def _offsets(self, item: int) -> List[int]:
+        """Calcula las posiciones del elemento (doble hashing, desplazadas por el bit de listo)"""
+        digest = hashlib.blake2b(str(item).encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [1 + (h1 + i * h2) % self.size for i in range(self.num_hashes)]
+
+    async def is_ready(self) -> bool:
+        """Indica si el filtro ya fue poblado"""
+        bits = await redis_client.get_bits(self.key, [self.READY_BIT])
+        return bool(bits and bits[0])
+
+    async def add(self, item: int) -> bool:
+        """Agrega un elemento al filtro"""
+        return await self.add_many([item])
+
+    async def add_many(self, items: Iterable[int]) -> bool:
+        """Agrega varios elementos al filtro en un solo pipeline"""
+        if not self.enabled:
+            return False
+        offsets = [offset for item in items for offset in self._offsets(item)]
+        if not offsets:
+            return True
+        if await redis_client.set_bits(self.key, offsets):
+            return True
+
+        self.failed_adds += 1
+        logger.warning("⚠️ No se pudo agregar al filtro de Bloom - se marca como no poblado")
+        await self.invalidate()
+        return False
+
+    async def invalidate(self) -> bool:
+        """
+        Apaga el bit de listo: el filtro deja de descartar IDs hasta reconstruirse.
+        Si Redis no responde, este proceso lo trata como no poblado y se reintenta
+        en la siguiente verificación periódica.
+        """
+        if await redis_client.set_bits(self.key, [self.READY_BIT], value=0):
+            self.unreliable = False
+            return True
+        self.unreliable = True
+        return False
+
+    def build_key(self, token: str) -> str:
+        """Clave temporal donde se construye un filtro nuevo antes de reemplazar al actual"""
+        return f"{self.key}:build:{token}"
+
+    async def add_many_to(self, key: str, items: Iterable[int]) -> bool:
+        """Agrega varios elementos a un filtro en construcción (ver build_key)"""
+        offsets = [offset for item in items for offset in self._offsets(item)]
+        return not offsets or await redis_client.set_bits(key, offsets)
+
+    async def publish_build(self, key: str) -> bool:
+        """Marca como poblado el filtro construido en key y reemplaza al actual"""
+        if not await redis_client.set_bits(key, [self.READY_BIT]):
+            return False
+        if not await redis_client.rename(key, self.key):
+            return False
+        self.unreliable = False
+        return True
+
+    async def might_contain_many(self, items: List[int]) -> Dict[int, bool]:
+        """
+        Consulta varios elementos en un solo pipeline.
+
+        Returns:
+            Diccionario elemento -> False si seguro no existe, True si puede existir
+        """
+        if not self.enabled or self.unreliable or not items:
+            return {item: True for item in items}
+
+        offsets_by_item = {item: self._offsets(item) for item in items}
+        offsets = [self.READY_BIT] + [o for item_offsets in offsets_by_item.values() for o in item_offsets]
+        bits = await redis_client.get_bits(self.key, offsets)
+
+        # Sin Redis o filtro sin poblar: no se puede descartar nada
+        if not bits or not bits[0]:
+            return {item: True for item in items}
+
+        result = {}
+        position = 1
+        for item, item_offsets in offsets_by_item.items():
+            result[item] = all(bits[position:position + len(item_offsets)])
+            position += len(item_offsets)
+
+        self.rejections += sum(1 for present in result.values() if not present)
+        return result
+
+    async def might_contain(self, item: int) -> bool:
+        """Indica si un elemento puede existir (False = seguro no existe)"""
+        return (await self.might_contain_many([item]))[item]
+
+    def get_stats(self) -> dict:
+        """Devuelve la configuración y estadísticas del filtro"""
+        return {
+            "enabled": self.enabled,
+            "size_bits": self.size,
+            "num_hashes": self.num_hashes,
+            "unreliable": self.unreliable,
+            "rejections": self.rejections,
+            "failed_adds": self.failed_adds
+        }
+
+
+# Filtro de IDs de torneos existentes
+tournament_bloom = BloomFilter(
+    key="tournament:bloom",
+    capacity=settings.CACHE_BLOOM_CAPACITY,
+    error_rate=settings.CACHE_BLOOM_ERROR_RATE,
+    enabled=settings.CACHE_BLOOM_ENABLED
+)
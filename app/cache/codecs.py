@@ -0,0 +1,136 @@
+import json
+import logging
+import zlib
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # Dependencia opcional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Dependencia opcional
+    msgpack = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # Dependencia opcional
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+
+# Formato de los valores en Redis:
+#   byte 0: codec (ver CODEC_IDS)
+#   byte 1: compresión (ver COMPRESSION_IDS)
+#   resto:  payload
+# Los valores escritos antes de este formato son JSON en texto plano y nunca
+# empiezan con un byte de control, así que se siguen leyendo sin vaciar la caché.
+CODEC_IDS = {"json": 1, "orjson": 2, "msgpack": 3}
+COMPRESSION_IDS = {"none": 0, "zlib": 1, "lz4": 2}
+
+
+def _encode(codec_id: int, value: Any) -> bytes:
+    """Serializa un valor con el codec indicado"""
+    if codec_id == CODEC_IDS["orjson"]:
+        return orjson.dumps(value, default=str)
+    if codec_id == CODEC_IDS["msgpack"]:
+        return msgpack.packb(value, default=str, use_bin_type=True)
+    return json.dumps(value, default=str).encode()
+
+
+def _decode(codec_id: int, payload: bytes) -> Any:
+    """Deserializa un payload con el codec indicado"""
+    if codec_id == CODEC_IDS["orjson"]:
+        return orjson.loads(payload) if orjson else json.loads(payload)
+    if codec_id == CODEC_IDS["msgpack"]:
+        if msgpack is None:
+            raise ValueError("Valor codificado con msgpack pero msgpack no está instalado")
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload)
+
+
+def _compress(compression_id: int, payload: bytes) -> bytes:
+    """Comprime un payload"""
+    if compression_id == COMPRESSION_IDS["lz4"]:
+        return lz4_frame.compress(payload)
+    return zlib.compress(payload)
+
+
+def _decompress(compression_id: int, payload: bytes) -> bytes:
+    """Descomprime un payload"""
+    if compression_id == COMPRESSION_IDS["none"]:
+        return payload
+    if compression_id == COMPRESSION_IDS["lz4"]:
+        if lz4_frame is None:
+            raise ValueError("Valor comprimido con lz4 pero lz4 no está instalado")
+        return lz4_frame.decompress(payload)
+    return zlib.decompress(payload)
+
+
+def _is_available(codec: str) -> bool:
+    """Indica si la librería de un codec o compresor está instalada"""
+    return {
+        "orjson": orjson is not None,
+        "msgpack": msgpack is not None,
+        "lz4": lz4_frame is not None,
+    }.get(codec, True)
+
+
+class CacheSerializer:
+    """
+    Serializa valores de caché a bytes con un codec y compresión configurables.
+
+    La lectura no depende de la configuración actual: el encabezado de cada valor
+    indica con qué se escribió, así que se puede cambiar de codec sin vaciar la caché.
+    """
+
+    def __init__(self, codec: str = "json", compression: str = "none", compression_min_size: int = 1024):
+        """
+        Args:
+            codec: "json", "orjson" o "msgpack"
+            compression: "none", "zlib" o "lz4"
+            compression_min_size: Tamaño mínimo en bytes para comprimir
+        """
+        if codec not in CODEC_IDS:
+            raise ValueError(f"Codec de caché desconocido: {codec}")
+        if compression not in COMPRESSION_IDS:
+            raise ValueError(f"Compresión de caché desconocida: {compression}")
+
+        if not _is_available(codec):
+            logger.warning(f"⚠️ Codec '{codec}' no instalado, usando json")
+            codec = "json"
+        if not _is_available(compression):
+            logger.warning(f"⚠️ Compresión '{compression}' no instalada, usando zlib")
+            compression = "zlib"
+
+        self.codec = codec
+        self.compression = compression
+        self.compression_min_size = compression_min_size
+        self._codec_id = CODEC_IDS[codec]
+        self._compression_id = COMPRESSION_IDS[compression]
+
+    def dumps(self, value: Any) -> bytes:
+        """Serializa un valor con encabezado de codec y compresión"""
+        payload = _encode(self._codec_id, value)
+        compression_id = COMPRESSION_IDS["none"]
+
+        if self._compression_id and len(payload) >= self.compression_min_size:
+            payload = _compress(self._compression_id, payload)
+            compression_id = self._compression_id
+
+        return bytes((self._codec_id, compression_id)) + payload
+
+    def loads(self, data: Optional[bytes]) -> Optional[Any]:
+        """Deserializa un valor leído de Redis (formato actual o JSON legado)"""
+        if not data:
+            return None
+
+        codec_id = data[0]
+        if codec_id not in CODEC_IDS.values():
+            # Valor legado en JSON plano (o contador de INCR)
+            return json.loads(data)
+
+        payload = _decompress(data[1], data[2:])
+        return _decode(codec_id, payload)
@@ -0,0 +1,89 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Any, Iterable, Callable
+
+
+class LocalCache:
+    """
+    Caché en memoria del proceso (L1) con política LRU y TTL.
+
+    No es thread-safe: está pensada para usarse desde el event loop de asyncio.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl: float = 5.0,
+        on_evict: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Args:
+            max_size: Número máximo de entradas antes de desalojar la menos usada
+            ttl: Tiempo de vida por defecto en segundos
+            on_evict: Se llama con la clave de cada entrada desalojada por LRU
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+        # Estadísticas
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Obtiene un valor si existe y no ha expirado"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Guarda un valor, desalojando la entrada menos usada si está llena"""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            evicted_key, _ = self._data.popitem(last=False)
+            self.evictions += 1
+            if self.on_evict:
+                self.on_evict(evicted_key)
+
+    def delete(self, keys: Iterable[str]):
+        """Elimina una o varias claves"""
+        for key in keys:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str):
+        """Elimina todas las claves que empiezan con el prefijo"""
+        for key in [k for k in self._data if k.startswith(prefix)]:
+            del self._data[key]
+
+    def clear(self):
+        """Vacía la caché"""
+        self._data.clear()
+
+    def get_stats(self) -> dict:
+        """Devuelve las estadísticas de la caché"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0
+        }
@@ -0,0 +1,126 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator
+
+# Límites superiores (ms) de los buckets de latencia de Redis
+LATENCY_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Eventos que se cuentan por familia de claves
+CACHE_EVENTS = ("hits", "misses", "negative_hits", "stale_serves", "evictions", "errors", "decode_errors")
+
+
+def key_family(key: str) -> str:
+    """
+    Familia de una clave: los segmentos anteriores al primero variable
+    (un ID, una generación "v3" o un filtro "k=v").
+
+    Ej: "tournament:42" -> "tournament", "tournament:list:v3:..." -> "tournament:list"
+    """
+    family = []
+    for part in key.split(":"):
+        if part.isdigit() or (part[:1] == "v" and part[1:].isdigit()) or "=" in part:
+            break
+        family.append(part)
+    return ":".join(family) or key
+
+
+class LatencyHistogram:
+    """Histograma acumulado de latencias con buckets fijos"""
+
+    def __init__(self, buckets_ms: Iterable[float] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)  # El último bucket es +Inf
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float):
+        """Registra una observación"""
+        index = next((i for i, bound in enumerate(self.buckets_ms) if elapsed_ms <= bound), len(self.buckets_ms))
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Percentil aproximado: límite superior del bucket que lo contiene"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets_ms, self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return bound
+        return round(self.max_ms, 3)
+
+    def get_stats(self) -> dict:
+        """Devuelve los buckets y un resumen de la distribución"""
+        labels = [f"le_{bound}" for bound in self.buckets_ms] + ["le_inf"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+class CacheMetrics:
+    """
+    Métricas de caché en memoria del proceso: contadores por familia de claves
+    y latencia por operación de Redis.
+    """
+
+    def __init__(self):
+        self.families: Dict[str, Dict[str, int]] = {}
+        self.latencies: Dict[str, LatencyHistogram] = {}
+
+    def record(self, key: str, event: str, count: int = 1):
+        """Incrementa un contador (ver CACHE_EVENTS) de la familia de la clave"""
+        counters = self.families.setdefault(key_family(key), dict.fromkeys(CACHE_EVENTS, 0))
+        counters[event] += count
+
+    def record_many(self, keys: Iterable[str], event: str):
+        """Incrementa un contador para cada clave"""
+        for key in keys:
+            self.record(key, event)
+
+    def observe(self, operation: str, elapsed_ms: float):
+        """Registra la latencia de una operación de Redis"""
+        histogram = self.latencies.get(operation)
+        if histogram is None:
+            histogram = self.latencies[operation] = LatencyHistogram()
+        histogram.observe(elapsed_ms)
+
+    @contextmanager
+    def timer(self, operation: str) -> Iterator[None]:
+        """Mide la duración del bloque (incluidos los fallos) como latencia de la operación"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(operation, (time.perf_counter() - started) * 1000)
+
+    def get_stats(self) -> dict:
+        """Devuelve los contadores por familia (con hit ratio) y las latencias"""
+        families = {}
+        for family, counters in sorted(self.families.items()):
+            lookups = counters["hits"] + counters["negative_hits"] + counters["misses"]
+            families[family] = {
+                **counters,
+                "hit_ratio": round((counters["hits"] + counters["negative_hits"]) / lookups, 4) if lookups else 0.0
+            }
+        return {
+            "families": families,
+            "redis_latency": {
+                operation: histogram.get_stats()
+                for operation, histogram in sorted(self.latencies.items())
+            }
+        }
+
+
+# Instancia global de métricas de caché
+cache_metrics = CacheMetrics()
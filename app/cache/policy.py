@@ -0,0 +1,71 @@
+from typing import Any, Callable, Dict, Optional
+from app.config import settings
+
+
+class CachePolicy:
+    """
+    Política de TTL para una familia de claves, según el estado del valor cacheado.
+
+    Registra aciertos y fallos por estado para poder ver el efecto de cada TTL
+    en el hit ratio.
+    """
+
+    # Políticas creadas, por familia (para exponer sus métricas)
+    registry: Dict[str, "CachePolicy"] = {}
+
+    def __init__(
+        self,
+        family: str,
+        default_ttl: int,
+        status_of: Callable[[Any], Optional[str]],
+        ttls: Optional[Dict[str, int]] = None
+    ):
+        """
+        Args:
+            family: Familia de claves (ej: "tournament", "tournament:list")
+            default_ttl: TTL para estados sin configuración
+            status_of: Extrae el estado del valor cacheado
+            ttls: TTL en segundos por estado (default: CACHE_TTL_POLICY[family])
+        """
+        self.family = family
+        self.default_ttl = default_ttl
+        self.status_of = status_of
+        self.ttls = dict(settings.CACHE_TTL_POLICY.get(family, {}) if ttls is None else ttls)
+
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+        CachePolicy.registry[family] = self
+
+    def _status_key(self, value: Any) -> str:
+        """Estado del valor, o "default" si no tiene"""
+        return self.status_of(value) or "default"
+
+    def ttl_for(self, value: Any) -> int:
+        """TTL (expiración blanda) para un valor"""
+        return self.ttls.get(self._status_key(value), self.default_ttl)
+
+    def stale_ttl_for(self, ttl: int) -> int:
+        """Ventana de stale-while-revalidate: nunca más larga que el propio TTL"""
+        return min(settings.CACHE_STALE_TTL, ttl)
+
+    def record(self, value: Any, hit: bool):
+        """Registra un acierto o fallo de caché para el estado del valor"""
+        counters = self.hits if hit else self.misses
+        status_key = self._status_key(value)
+        counters[status_key] = counters.get(status_key, 0) + 1
+
+    def get_stats(self) -> dict:
+        """Devuelve TTL y hit ratio por estado"""
+        stats = {}
+        for status_key in sorted(set(self.ttls) | set(self.hits) | set(self.misses) | {"default"}):
+            hits = self.hits.get(status_key, 0)
+            misses = self.misses.get(status_key, 0)
+            total = hits + misses
+            stats[status_key] = {
+                "ttl": self.ttls.get(status_key, self.default_ttl),
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / total, 4) if total else 0.0
+            }
+        return stats
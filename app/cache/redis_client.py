@@ -1,167 +1,606 @@
-import redis
+import redis.asyncio as redis
+import asyncio
+import enum
 import json
 import logging
-from typing import Optional, Any
+import time
+from typing import Optional, Any, Dict, Iterable, List
+from app.cache.codecs import CacheSerializer
+from app.cache.metrics import cache_metrics
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class CircuitState(str, enum.Enum):
+    """Estados del circuit breaker de Redis"""
+    HEALTHY = "healthy"      # Operando normalmente
+    DEGRADED = "degraded"    # Hubo fallos recientes, pero se siguen intentando operaciones
+    OPEN = "open"            # Circuito abierto: se omite Redis hasta que reconecte
+
+
 class RedisClient:
-    """Cliente de Redis para manejo de caché"""
-    
+    """Cliente asíncrono de Redis para manejo de caché"""
+
+    SCAN_BATCH_SIZE = 500  # Claves por iteración de SCAN/UNLINK
+
+    # Libera el lock solo si sigue perteneciendo a quien lo tomó
+    RELEASE_LOCK_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
     def __init__(self):
-        """Inicializa la conexión a Redis"""
+        """Inicializa el cliente (la conexión se establece con connect())"""
+        self.pool: Optional[redis.BlockingConnectionPool] = None
         self.client: Optional[redis.Redis] = None
-        self._connect()
-    
-    def _connect(self):
-        """Establece la conexión con Redis"""
-        try:
-            self.client = redis.Redis(
-                host=settings.REDIS_HOST,
-                port=settings.REDIS_PORT,
-                db=settings.REDIS_DB,
-                password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
-                decode_responses=True,  # Decodifica automáticamente a strings
-                socket_connect_timeout=5,
-                socket_timeout=5
-            )
+
+        # Circuit breaker
+        self.state = CircuitState.OPEN
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.opened_at: Optional[float] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+        # Codec de los valores cacheados
+        self.serializer = CacheSerializer(
+            codec=settings.CACHE_CODEC,
+            compression=settings.CACHE_COMPRESSION,
+            compression_min_size=settings.CACHE_COMPRESSION_MIN_SIZE
+        )
+
+    def _create_client(self):
+        """
+        Crea el pool acotado y el cliente de Redis. Con el pool lleno, un
+        request espera hasta REDIS_POOL_TIMEOUT por una conexión libre en lugar
+        de fallar al instante (lo que contaría como fallo del circuit breaker).
+        """
+        self.pool = redis.BlockingConnectionPool(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+            decode_responses=False,  # Los valores son bytes con encabezado de codec
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT
+        )
+        self.client = redis.Redis(connection_pool=self.pool)
+
+    async def connect(self):
+        """Establece la conexión con Redis; si falla, reintenta en background"""
+        try:
+            self._create_client()
             # Verificar conexión
-            self.client.ping()
+            await self.client.ping()
+            self._record_success()
             logger.info(f"✅ Conectado a Redis en {settings.REDIS_HOST}:{settings.REDIS_PORT}")
-        except redis.ConnectionError as e:
-            logger.warning(f"⚠️ No se pudo conectar a Redis: {e}")
-            logger.warning("⚠️ La aplicación funcionará sin caché")
-            self.client = None
         except Exception as e:
-            logger.error(f"❌ Error inesperado al conectar a Redis: {e}")
-            self.client = None
-    
+            logger.warning(f"⚠️ No se pudo conectar a Redis: {e}")
+            logger.warning("⚠️ La aplicación funcionará sin caché hasta que Redis se recupere")
+            self._open_circuit(e)
+
     def is_connected(self) -> bool:
-        """Verifica si Redis está conectado"""
-        if not self.client:
-            return False
+        """
+        Indica si Redis está disponible según el circuit breaker.
+        No hace PING: refleja el resultado de las últimas operaciones.
+        """
+        return self.client is not None and self.state != CircuitState.OPEN
+
+    def _record_success(self):
+        """Registra una operación exitosa y cierra el circuito"""
+        if self.state != CircuitState.HEALTHY:
+            logger.info("✅ Redis operando normalmente")
+        self.state = CircuitState.HEALTHY
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def _record_failure(self, error: Exception):
+        """Registra un fallo; abre el circuito al superar el umbral"""
+        self.consecutive_failures += 1
+        self.last_error = str(error)
+
+        if self.consecutive_failures >= settings.REDIS_BREAKER_THRESHOLD:
+            self._open_circuit(error)
+        elif self.state == CircuitState.HEALTHY:
+            self.state = CircuitState.DEGRADED
+            logger.warning(f"⚠️ Redis degradado: {error}")
+
+    def _open_circuit(self, error: Exception):
+        """Abre el circuito y lanza la tarea de reconexión"""
+        if self.state != CircuitState.OPEN or self.opened_at is None:
+            logger.error(f"🔌 Circuito de Redis abierto: {error}")
+            self.opened_at = time.time()
+        self.state = CircuitState.OPEN
+        self.last_error = str(error)
+
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect_loop())
+
+    async def _reconnect_loop(self):
+        """Sondea Redis con backoff exponencial hasta cerrar el circuito"""
+        delay = settings.REDIS_RECONNECT_MIN_DELAY
+        while self.state == CircuitState.OPEN:
+            await asyncio.sleep(delay)
+            try:
+                if self.client is None:
+                    self._create_client()
+                await self.client.ping()
+                self._record_success()
+                logger.info(f"🔁 Reconectado a Redis en {settings.REDIS_HOST}:{settings.REDIS_PORT}")
+                return
+            except Exception as e:
+                self.last_error = str(e)
+                delay = min(delay * 2, settings.REDIS_RECONNECT_MAX_DELAY)
+                logger.debug(f"Redis sigue sin responder, próximo intento en {delay}s")
+
+    def get_status(self) -> dict:
+        """Devuelve el estado del circuit breaker (sin consultar Redis)"""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "open_since": self.opened_at,
+            "reconnecting": self._reconnect_task is not None and not self._reconnect_task.done()
+        }
+
+    def _loads(self, key: str, value: Optional[bytes]) -> Optional[Any]:
+        """
+        Deserializa un valor leído de Redis. Un valor que este proceso no puede
+        decodificar (codec no instalado, payload corrupto) cuenta como miss y no
+        como fallo de Redis: no debe abrir el circuito.
+        """
         try:
-            self.client.ping()
-            return True
-        except:
-            return False
-    
-    def get(self, key: str) -> Optional[Any]:
+            return self.serializer.loads(value)
+        except Exception as e:
+            logger.warning(f"⚠️ Valor de caché no decodificable en '{key}': {e}")
+            cache_metrics.record(key, "decode_errors")
+            return None
+
+    async def get(self, key: str) -> Optional[Any]:
         """
         Obtiene un valor del caché.
-        
+
         Args:
             key: Clave a buscar
-            
+
         Returns:
             Valor deserializado o None si no existe
         """
         if not self.is_connected():
             return None
-        
+
         try:
-            value = self.client.get(key)
-            if value:
-                return json.loads(value)
-            return None
+            with cache_metrics.timer("get"):
+                value = await self.client.get(key)
+            self._record_success()
         except Exception as e:
             logger.error(f"Error al obtener de Redis: {e}")
+            cache_metrics.record(key, "errors")
+            self._record_failure(e)
             return None
-    
-    def set(self, key: str, value: Any, ttl: int = 300) -> bool:
+
+        return self._loads(key, value)
+
+    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
         """
         Guarda un valor en el caché.
-        
+
         Args:
             key: Clave
-            value: Valor a guardar (será serializado a JSON)
+            value: Valor a guardar (será serializado con el codec configurado)
             ttl: Tiempo de vida en segundos (default: 5 minutos)
-            
+
         Returns:
             True si se guardó correctamente, False en caso contrario
         """
         if not self.is_connected():
             return False
-        
+
         try:
-            serialized_value = json.dumps(value, default=str)
-            self.client.setex(key, ttl, serialized_value)
+            serialized_value = self.serializer.dumps(value)
+            with cache_metrics.timer("set"):
+                await self.client.setex(key, ttl, serialized_value)
+            self._record_success()
             return True
         except Exception as e:
             logger.error(f"Error al guardar en Redis: {e}")
+            cache_metrics.record(key, "errors")
+            self._record_failure(e)
+            return False
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Obtiene varios valores del caché en un solo round trip (MGET).
+
+        Args:
+            keys: Claves a buscar
+
+        Returns:
+            Lista de valores deserializados (None para las claves inexistentes),
+            en el mismo orden que las claves
+        """
+        if not keys or not self.is_connected():
+            return [None] * len(keys)
+
+        try:
+            with cache_metrics.timer("mget"):
+                values = await self.client.mget(keys)
+            self._record_success()
+        except Exception as e:
+            logger.error(f"Error al obtener varias claves de Redis: {e}")
+            cache_metrics.record_many(keys, "errors")
+            self._record_failure(e)
+            return [None] * len(keys)
+
+        return [self._loads(key, value) for key, value in zip(keys, values)]
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: int = 300,
+        ttls: Optional[Dict[str, int]] = None
+    ) -> bool:
+        """
+        Guarda varios valores en el caché usando un pipeline.
+
+        Args:
+            items: Diccionario clave -> valor (serializado con el codec configurado)
+            ttl: Tiempo de vida en segundos
+            ttls: TTL por clave (tiene prioridad sobre ttl)
+
+        Returns:
+            True si se guardaron correctamente
+        """
+        if not items or not self.is_connected():
+            return False
+
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.setex(key, (ttls or {}).get(key, ttl), self.serializer.dumps(value))
+                with cache_metrics.timer("set_many"):
+                    await pipe.execute()
+            self._record_success()
+            return True
+        except Exception as e:
+            logger.error(f"Error al guardar varias claves en Redis: {e}")
+            cache_metrics.record_many(items, "errors")
+            self._record_failure(e)
             return False
-    
-    def delete(self, key: str) -> bool:
+
+    async def delete(self, key: str) -> bool:
         """
         Elimina una clave del caché.
-        
+
         Args:
             key: Clave a eliminar
-            
+
         Returns:
             True si se eliminó, False en caso contrario
         """
         if not self.is_connected():
             return False
-        
+
         try:
-            self.client.delete(key)
+            with cache_metrics.timer("delete"):
+                await self.client.delete(key)
+            self._record_success()
             return True
         except Exception as e:
             logger.error(f"Error al eliminar de Redis: {e}")
+            cache_metrics.record(key, "errors")
+            self._record_failure(e)
             return False
-    
-    def delete_pattern(self, pattern: str) -> int:
+
+    async def delete_pattern(self, pattern: str) -> int:
         """
         Elimina todas las claves que coinciden con un patrón.
-        
+
         Args:
             pattern: Patrón de búsqueda (ej: "tournament:*")
-            
+
         Returns:
             Número de claves eliminadas
         """
         if not self.is_connected():
             return 0
-        
+
         try:
-            keys = self.client.keys(pattern)
-            if keys:
-                return self.client.delete(*keys)
-            return 0
+            # SCAN incremental + UNLINK: no bloquea Redis como KEYS/DEL
+            deleted = 0
+            batch = []
+            with cache_metrics.timer("delete_pattern"):
+                async for key in self.client.scan_iter(match=pattern, count=self.SCAN_BATCH_SIZE):
+                    batch.append(key)
+                    if len(batch) >= self.SCAN_BATCH_SIZE:
+                        deleted += await self.client.unlink(*batch)
+                        batch = []
+                if batch:
+                    deleted += await self.client.unlink(*batch)
+            self._record_success()
+            return deleted
         except Exception as e:
             logger.error(f"Error al eliminar patrón de Redis: {e}")
+            cache_metrics.record(pattern, "errors")
+            self._record_failure(e)
             return 0
-    
-    def flush_all(self) -> bool:
+
+    async def write_batch(
+        self,
+        set_items: Optional[Dict[str, Any]] = None,
+        ttl: int = 300,
+        ttls: Optional[Dict[str, int]] = None,
+        delete_keys: Iterable[str] = (),
+        incr_keys: Iterable[str] = (),
+        messages: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Aplica escrituras, borrados, incrementos y publicaciones en un único
+        MULTI/EXEC (un solo round trip).
+
+        Args:
+            set_items: Diccionario clave -> valor a guardar con SETEX
+            ttl: Tiempo de vida en segundos de los valores guardados
+            ttls: TTL por clave (tiene prioridad sobre ttl)
+            delete_keys: Claves a eliminar (UNLINK)
+            incr_keys: Contadores a incrementar (INCR)
+            messages: Diccionario canal -> mensaje a publicar (serializado a JSON)
+
+        Returns:
+            True si la transacción se ejecutó correctamente
+        """
+        set_items = set_items or {}
+        messages = messages or {}
+        delete_keys = list(delete_keys)
+        incr_keys = list(incr_keys)
+
+        if not (set_items or delete_keys or incr_keys or messages) or not self.is_connected():
+            return False
+
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                for key, value in set_items.items():
+                    pipe.setex(key, (ttls or {}).get(key, ttl), self.serializer.dumps(value))
+                if delete_keys:
+                    pipe.unlink(*delete_keys)
+                for key in incr_keys:
+                    pipe.incr(key)
+                for channel, message in messages.items():
+                    pipe.publish(channel, json.dumps(message, default=str))
+                with cache_metrics.timer("write_batch"):
+                    await pipe.execute()
+            self._record_success()
+            return True
+        except Exception as e:
+            logger.error(f"Error al aplicar lote de escrituras en Redis: {e}")
+            cache_metrics.record_many([*set_items, *delete_keys, *incr_keys], "errors")
+            self._record_failure(e)
+            return False
+
+    async def get_bits(self, key: str, offsets: List[int]) -> Optional[List[int]]:
+        """
+        Lee varios bits de un bitmap en un solo pipeline (GETBIT).
+
+        Args:
+            key: Clave del bitmap
+            offsets: Posiciones a leer
+
+        Returns:
+            Lista de bits (0/1) en el mismo orden, o None si Redis no está disponible
+        """
+        if not self.is_connected():
+            return None
+
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for offset in offsets:
+                    pipe.getbit(key, offset)
+                with cache_metrics.timer("get_bits"):
+                    bits = await pipe.execute()
+            self._record_success()
+            return bits
+        except Exception as e:
+            logger.error(f"Error al leer bits de Redis: {e}")
+            cache_metrics.record(key, "errors")
+            self._record_failure(e)
+            return None
+
+    async def set_bits(self, key: str, offsets: List[int], value: int = 1) -> bool:
+        """
+        Enciende (o apaga) varios bits de un bitmap en un solo pipeline (SETBIT).
+
+        Args:
+            key: Clave del bitmap
+            offsets: Posiciones a modificar
+            value: 1 para encender, 0 para apagar
+
+        Returns:
+            True si se actualizaron correctamente
+        """
+        if not offsets or not self.is_connected():
+            return False
+
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for offset in offsets:
+                    pipe.setbit(key, offset, value)
+                with cache_metrics.timer("set_bits"):
+                    await pipe.execute()
+            self._record_success()
+            return True
+        except Exception as e:
+            logger.error(f"Error al escribir bits en Redis: {e}")
+            cache_metrics.record(key, "errors")
+            self._record_failure(e)
+            return False
+
+    async def rename(self, source: str, destination: str) -> bool:
+        """
+        Reemplaza atómicamente una clave por otra (RENAME).
+
+        Args:
+            source: Clave a renombrar
+            destination: Clave destino (se sobrescribe si existe)
+
+        Returns:
+            True si se renombró correctamente
+        """
+        if not self.is_connected():
+            return False
+
+        try:
+            with cache_metrics.timer("rename"):
+                await self.client.rename(source, destination)
+            self._record_success()
+            return True
+        except Exception as e:
+            logger.error(f"Error al renombrar clave en Redis: {e}")
+            cache_metrics.record(destination, "errors")
+            self._record_failure(e)
+            return False
+
+    async def incr(self, key: str) -> Optional[int]:
+        """
+        Incrementa atómicamente un contador.
+
+        Args:
+            key: Clave del contador
+
+        Returns:
+            Nuevo valor o None si no se pudo incrementar
+        """
+        if not self.is_connected():
+            return None
+
+        try:
+            with cache_metrics.timer("incr"):
+                value = await self.client.incr(key)
+            self._record_success()
+            return value
+        except Exception as e:
+            logger.error(f"Error al incrementar en Redis: {e}")
+            cache_metrics.record(key, "errors")
+            self._record_failure(e)
+            return None
+
+    async def acquire_lock(self, key: str, token: str, ttl: float) -> Optional[bool]:
+        """
+        Intenta tomar un lock con SET NX PX.
+
+        Args:
+            key: Clave del lock
+            token: Identificador único del dueño del lock
+            ttl: Duración máxima del lock en segundos
+
+        Returns:
+            True si se tomó, False si otro lo tiene, None si Redis no está disponible
+        """
+        if not self.is_connected():
+            return None
+
+        try:
+            with cache_metrics.timer("acquire_lock"):
+                acquired = await self.client.set(key, token, nx=True, px=int(ttl * 1000))
+            self._record_success()
+            return bool(acquired)
+        except Exception as e:
+            logger.error(f"Error al tomar lock en Redis: {e}")
+            cache_metrics.record(key, "errors")
+            self._record_failure(e)
+            return None
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        """
+        Libera un lock si todavía pertenece al token indicado.
+
+        Args:
+            key: Clave del lock
+            token: Identificador con el que se tomó el lock
+
+        Returns:
+            True si se liberó
+        """
+        if not self.is_connected():
+            return False
+
+        try:
+            with cache_metrics.timer("release_lock"):
+                released = await self.client.eval(self.RELEASE_LOCK_SCRIPT, 1, key, token)
+            self._record_success()
+            return bool(released)
+        except Exception as e:
+            logger.error(f"Error al liberar lock en Redis: {e}")
+            cache_metrics.record(key, "errors")
+            self._record_failure(e)
+            return False
+
+    async def publish(self, channel: str, message: Any) -> bool:
+        """
+        Publica un mensaje en un canal de pub/sub.
+
+        Args:
+            channel: Canal de destino
+            message: Mensaje (será serializado a JSON)
+
+        Returns:
+            True si se publicó correctamente
+        """
+        if not self.is_connected():
+            return False
+
+        try:
+            with cache_metrics.timer("publish"):
+                await self.client.publish(channel, json.dumps(message, default=str))
+            self._record_success()
+            return True
+        except Exception as e:
+            logger.error(f"Error al publicar en Redis: {e}")
+            cache_metrics.record(channel, "errors")
+            self._record_failure(e)
+            return False
+
+    def pubsub(self) -> Optional[redis.client.PubSub]:
+        """Crea un objeto PubSub para suscribirse a canales"""
+        if not self.is_connected():
+            return None
+        return self.client.pubsub(ignore_subscribe_messages=True)
+
+    async def flush_all(self) -> bool:
         """
         Elimina todas las claves del caché.
-        
+
         Returns:
             True si se limpió correctamente
         """
         if not self.is_connected():
             return False
-        
+
         try:
-            self.client.flushdb()
+            await self.client.flushdb()
+            self._record_success()
             logger.info("🗑️ Caché de Redis limpiado")
             return True
         except Exception as e:
             logger.error(f"Error al limpiar Redis: {e}")
+            self._record_failure(e)
             return False
-    
-    def close(self):
+
+    async def close(self):
         """Cierra la conexión a Redis"""
+        if self._reconnect_task and not self._reconnect_task.done():
+            self._reconnect_task.cancel()
         if self.client:
             try:
-                self.client.close()
+                await self.client.aclose()
+                await self.pool.disconnect()
                 logger.info("👋 Conexión a Redis cerrada")
             except Exception as e:
                 logger.error(f"Error al cerrar conexión a Redis: {e}")
 
 
 # Instancia global del cliente Redis
-redis_client = RedisClient()
\ No newline at end of file
+redis_client = RedisClient()
@@ -0,0 +1,608 @@
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+import uuid
+from typing import Optional, Any, Iterable, Callable, Awaitable, Dict, List
+from app.cache.local_cache import LocalCache
+from app.cache.metrics import cache_metrics
+from app.cache.policy import CachePolicy
+from app.cache.redis_client import redis_client
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Resultado de una recarga en background omitida porque otra réplica tenía el lock
+_SKIPPED = object()
+
+
+class TieredCache:
+    """
+    Caché de dos niveles: L1 en memoria del proceso delante de Redis (L2).
+
+    Las invalidaciones se aplican localmente y se difunden por Redis pub/sub
+    para que todas las réplicas desalojen su L1.
+    """
+
+    def __init__(self):
+        """Inicializa la caché (el listener se arranca con start())"""
+        self.l1_enabled = settings.CACHE_L1_ENABLED
+        self.local = LocalCache(
+            max_size=settings.CACHE_L1_MAX_SIZE,
+            ttl=settings.CACHE_L1_TTL,
+            on_evict=lambda key: cache_metrics.record(key, "evictions")
+        )
+        self.channel = settings.CACHE_INVALIDATION_CHANNEL
+        self._listener_task: Optional[asyncio.Task] = None
+
+        # Cargas en curso por clave (single-flight dentro del proceso)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+        # Estadísticas de L2 (solo consultas que no resolvió L1)
+        self.l2_hits = 0
+        self.l2_misses = 0
+
+        # Estadísticas de single-flight
+        self.coalesced = 0       # Requests que esperaron la carga de otro request del proceso
+        self.lock_waits = 0      # Cargas resueltas por otra réplica mientras esperábamos el lock
+
+        # Estadísticas de stale-while-revalidate
+        self.stale_serves = 0    # Valores servidos entre la expiración blanda y la dura
+        self.early_refreshes = 0 # Recargas anticipadas por XFetch
+        self.refresh_errors = 0  # Recargas en background fallidas
+
+        # Entradas negativas (claves cuyo valor no existe en la fuente)
+        self.negative_hits = 0
+
+    async def start(self):
+        """Arranca el listener de invalidaciones si L1 está habilitada"""
+        if self.l1_enabled and self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen())
+            logger.info(f"🧠 Caché L1 habilitada (max={self.local.max_size}, ttl={self.local.ttl}s)")
+
+    async def stop(self):
+        """Detiene el listener de invalidaciones y las recargas en background"""
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+        for task in list(self._refresh_tasks):
+            task.cancel()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Obtiene un valor buscando primero en L1 y luego en Redis.
+
+        Args:
+            key: Clave a buscar
+
+        Returns:
+            Valor o None si no existe en ningún nivel
+        """
+        if self.l1_enabled:
+            value = self.local.get(key)
+            if value is not None:
+                return value
+
+        value = await redis_client.get(key)
+        if value is None:
+            self.l2_misses += 1
+            return None
+
+        self.l2_hits += 1
+        if self.l1_enabled:
+            self.local.set(key, value)
+        return value
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Obtiene varias entradas vigentes: primero de L1 y el resto con un solo MGET.
+        Las entradas con la expiración blanda vencida se tratan como miss.
+
+        Args:
+            keys: Claves a buscar
+
+        Returns:
+            Diccionario clave -> valor solo con las claves encontradas
+        """
+        found: Dict[str, Any] = {}
+        pending = []
+        now = time.time()
+
+        for key in keys:
+            entry = self.local.get(key) if self.l1_enabled else None
+            if self._is_entry(entry) and entry["soft"] > now:
+                found[key] = entry["v"]
+                cache_metrics.record(key, "hits" if entry["v"] is not None else "negative_hits")
+            else:
+                pending.append(key)
+
+        if pending:
+            entries = await redis_client.mget(pending)
+            for key, entry in zip(pending, entries):
+                if self._is_entry(entry) and entry["soft"] > now:
+                    self.l2_hits += 1
+                    found[key] = entry["v"]
+                    cache_metrics.record(key, "hits" if entry["v"] is not None else "negative_hits")
+                    if self.l1_enabled:
+                        self.local.set(key, entry)
+                else:
+                    self.l2_misses += 1
+                    cache_metrics.record(key, "misses")
+
+        return found
+
+    async def set_many(
+        self,
+        values: Dict[str, Any],
+        ttl: int = 300,
+        stale_ttl: Optional[int] = None,
+        policy: Optional[CachePolicy] = None
+    ) -> bool:
+        """
+        Guarda varias entradas (con expiración blanda) en un solo pipeline.
+
+        Args:
+            values: Diccionario clave -> valor
+            ttl: Segundos hasta la expiración blanda
+            stale_ttl: Segundos extra en que se sirve el valor vencido (default: CACHE_STALE_TTL)
+            policy: Si se indica, define el TTL de cada valor según su estado
+
+        Returns:
+            True si se guardaron en Redis
+        """
+        entries, hard_ttls = self._build_entries(values, ttl, stale_ttl, policy)
+
+        if self.l1_enabled:
+            for key, entry in entries.items():
+                self.local.set(key, entry, hard_ttls[key])
+        return await redis_client.set_many(entries, ttls=hard_ttls)
+
+    def _build_entries(
+        self,
+        values: Dict[str, Any],
+        ttl: int,
+        stale_ttl: Optional[int],
+        policy: Optional[CachePolicy]
+    ) -> tuple[Dict[str, dict], Dict[str, int]]:
+        """Arma las entradas con expiración blanda y el TTL duro de cada clave"""
+        now = time.time()
+        entries = {}
+        hard_ttls = {}
+        for key, value in values.items():
+            value_ttl, value_stale_ttl = self._resolve_ttl(value, ttl, stale_ttl, policy)
+            entries[key] = {"v": value, "soft": now + value_ttl, "delta": 0}
+            hard_ttls[key] = value_ttl + value_stale_ttl
+        return entries, hard_ttls
+
+    @staticmethod
+    def _resolve_ttl(
+        value: Any,
+        ttl: int,
+        stale_ttl: Optional[int],
+        policy: Optional[CachePolicy]
+    ) -> tuple[int, int]:
+        """Resuelve (TTL blando, ventana stale) de un valor, usando la política si hay"""
+        if policy is not None and value is not None:
+            ttl = policy.ttl_for(value)
+            return ttl, policy.stale_ttl_for(ttl)
+        return ttl, settings.CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int = 300,
+        refresh_loader: Optional[Callable[[], Awaitable[Any]]] = None,
+        stale_ttl: Optional[int] = None,
+        negative_ttl: Optional[int] = None,
+        policy: Optional[CachePolicy] = None
+    ) -> Any:
+        """
+        Obtiene un valor del caché o lo carga con single-flight.
+
+        Cada entrada tiene una expiración blanda (ttl) y una dura (ttl + stale_ttl).
+        Entre ambas se devuelve el valor viejo de inmediato y se recarga una sola vez
+        en background. Con CACHE_XFETCH_ENABLED la recarga puede adelantarse de forma
+        probabilística antes de la expiración blanda (XFetch).
+
+        Ante un miss, solo un loader por clave se ejecuta en el proceso; el resto de
+        requests espera su resultado (o su excepción). Entre réplicas se coordina con
+        un lock corto en Redis.
+
+        Args:
+            key: Clave a buscar
+            loader: Corrutina sin argumentos que obtiene el valor de la fuente
+            ttl: Segundos hasta la expiración blanda
+            refresh_loader: Loader para las recargas en background (default: loader).
+                            Debe ser independiente del request que lo origina.
+            stale_ttl: Segundos que se sirve el valor viejo tras la expiración blanda
+                       (default: CACHE_STALE_TTL)
+            negative_ttl: Si se indica, cuando el loader retorna None se guarda una
+                          entrada negativa por esa cantidad de segundos
+            policy: Si se indica, define ttl y stale_ttl según el estado del valor
+                    y registra aciertos/fallos por estado
+
+        Returns:
+            Valor cacheado o recién cargado (None si no existe)
+        """
+        entry = await self.get(key)
+        if self._is_entry(entry):
+            if entry["v"] is None:
+                self.negative_hits += 1
+                cache_metrics.record(key, "negative_hits")
+                return None
+            cache_metrics.record(key, "hits")
+            if policy is not None:
+                policy.record(entry["v"], hit=True)
+            if self._should_refresh(key, entry):
+                self._schedule_refresh(key, refresh_loader or loader, ttl, stale_ttl, policy)
+            return entry["v"]
+
+        while key in self._inflight:
+            self.coalesced += 1
+            value = await asyncio.shield(self._inflight[key])
+            if value is not _SKIPPED:
+                return value
+
+        cache_metrics.record(key, "misses")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load_with_lock(key, loader, ttl, stale_ttl, policy, negative_ttl)
+            future.set_result(value)
+            if policy is not None and value is not None:
+                policy.record(value, hit=False)
+            return value
+        except asyncio.CancelledError:
+            # El request que cargaba se canceló (ej: el cliente se desconectó):
+            # quienes esperaban no deben fallar con él, reintentan la carga
+            future.set_result(_SKIPPED)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Marca la excepción como recuperada si nadie estaba esperando
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    @staticmethod
+    def _is_entry(entry: Any) -> bool:
+        """Indica si un valor cacheado tiene el formato de entrada con expiración blanda"""
+        return isinstance(entry, dict) and "v" in entry and "soft" in entry
+
+    def _should_refresh(self, key: str, entry: dict) -> bool:
+        """Decide si una entrada debe recargarse (vencida o por XFetch)"""
+        now = time.time()
+        if now >= entry["soft"]:
+            self.stale_serves += 1
+            cache_metrics.record(key, "stale_serves")
+            return True
+
+        if settings.CACHE_XFETCH_ENABLED:
+            # XFetch: adelanta la recarga con más probabilidad cuanto más cerca de
+            # la expiración y cuanto más caro fue calcular el valor (delta)
+            delta = entry.get("delta", 0)
+            jitter = -math.log(1.0 - random.random())
+            if now + delta * settings.CACHE_XFETCH_BETA * jitter >= entry["soft"]:
+                self.early_refreshes += 1
+                return True
+
+        return False
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: Optional[int],
+        policy: Optional[CachePolicy]
+    ):
+        """Lanza una recarga en background si no hay otra en curso para la clave"""
+        if key in self._inflight:
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        task = asyncio.create_task(self._refresh(key, loader, ttl, stale_ttl, policy, future))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: Optional[int],
+        policy: Optional[CachePolicy],
+        future: asyncio.Future
+    ):
+        """Recarga una clave en background y resuelve a quienes la esperaban"""
+        try:
+            value = await self._load_with_lock(key, loader, ttl, stale_ttl, policy, wait_for_peer=False)
+            future.set_result(value)
+        except asyncio.CancelledError:
+            # Recarga cancelada (ej: al cerrar): quienes esperaban reintentan la carga
+            future.set_result(_SKIPPED)
+            raise
+        except Exception as e:
+            self.refresh_errors += 1
+            logger.warning(f"⚠️ Error al recargar {key} en background: {e}")
+            future.set_exception(e)
+            future.exception()
+        finally:
+            del self._inflight[key]
+
+    async def _load_with_lock(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: Optional[int],
+        policy: Optional[CachePolicy] = None,
+        negative_ttl: Optional[int] = None,
+        wait_for_peer: bool = True
+    ) -> Any:
+        """
+        Ejecuta el loader tomando un lock en Redis para no duplicar la carga entre réplicas.
+        Si otra réplica tiene el lock y wait_for_peer es False, no carga y retorna _SKIPPED.
+        """
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        acquired = await redis_client.acquire_lock(lock_key, token, settings.CACHE_LOCK_TTL)
+
+        if acquired is False:
+            if not wait_for_peer:
+                return _SKIPPED
+
+            # Otra réplica está cargando: esperar a que publique el valor
+            deadline = time.monotonic() + settings.CACHE_LOCK_TTL
+            while time.monotonic() < deadline:
+                await asyncio.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+                entry = await redis_client.get(key)
+                if self._is_entry(entry):
+                    self.lock_waits += 1
+                    if self.l1_enabled:
+                        self.local.set(key, entry, max(entry["soft"] - time.time(), 0))
+                    return entry["v"]
+            # El dueño del lock no terminó a tiempo: cargar nosotros
+
+        try:
+            started = time.monotonic()
+            value = await loader()
+            delta = round(time.monotonic() - started, 4)
+            if value is not None:
+                value_ttl, value_stale_ttl = self._resolve_ttl(value, ttl, stale_ttl, policy)
+                entry = {
+                    "v": value,
+                    "soft": time.time() + value_ttl,   # Expiración blanda (epoch)
+                    "delta": delta                     # Costo de recálculo (XFetch)
+                }
+                await self.set(key, entry, value_ttl + value_stale_ttl)
+            elif negative_ttl:
+                # Entrada negativa: se sirve hasta expirar, sin recarga en background
+                entry = {"v": None, "soft": time.time() + negative_ttl, "delta": delta}
+                await self.set(key, entry, negative_ttl)
+            return value
+        finally:
+            if acquired:
+                await redis_client.release_lock(lock_key, token)
+
+    @staticmethod
+    def _namespace_version_key(namespace: str) -> str:
+        """Clave del contador de generación de un namespace"""
+        return f"{namespace}:gen"
+
+    async def namespace_version(self, namespace: str) -> int:
+        """
+        Obtiene la generación actual de un namespace.
+
+        Args:
+            namespace: Namespace (ej: "tournament:list")
+
+        Returns:
+            Generación actual (0 si nunca se invalidó)
+        """
+        version_key = self._namespace_version_key(namespace)
+        if self.l1_enabled:
+            version = self.local.get(version_key)
+            if version is not None:
+                return version
+
+        version = await redis_client.get(version_key) or 0
+        if self.l1_enabled:
+            self.local.set(version_key, version)
+        return version
+
+    async def namespaced_key(self, namespace: str, suffix: str) -> str:
+        """
+        Construye una clave dentro de la generación actual de un namespace.
+        Al invalidar el namespace las claves viejas quedan huérfanas y expiran por TTL.
+
+        Args:
+            namespace: Namespace (ej: "tournament:list")
+            suffix: Parte variable de la clave
+
+        Returns:
+            Clave versionada (ej: "tournament:list:v3:page=1")
+        """
+        version = await self.namespace_version(namespace)
+        return f"{namespace}:v{version}:{suffix}"
+
+    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
+        """
+        Guarda un valor en ambos niveles.
+
+        Args:
+            key: Clave
+            value: Valor a guardar
+            ttl: Tiempo de vida en Redis (L1 usa el menor entre este y su TTL)
+
+        Returns:
+            True si se guardó en Redis
+        """
+        if self.l1_enabled:
+            self.local.set(key, value, ttl)
+        return await redis_client.set(key, value, ttl=ttl)
+
+    async def write_through(
+        self,
+        values: Dict[str, Any],
+        ttl: int = 300,
+        namespaces: Iterable[str] = (),
+        stale_ttl: Optional[int] = None,
+        policy: Optional[CachePolicy] = None
+    ) -> bool:
+        """
+        Escribe valores frescos en el caché e invalida namespaces en la misma
+        transacción de Redis, para que tras una escritura no haya un miss.
+        Las demás réplicas descartan su copia en L1 y la releen de Redis.
+
+        Args:
+            values: Diccionario clave -> valor actualizado
+            ttl: Segundos hasta la expiración blanda
+            namespaces: Namespaces cuya generación se incrementa
+            stale_ttl: Segundos extra en que se sirve el valor vencido (default: CACHE_STALE_TTL)
+            policy: Si se indica, define el TTL de cada valor según su estado
+
+        Returns:
+            True si se aplicó en Redis
+        """
+        namespaces = list(namespaces)
+        entries, hard_ttls = self._build_entries(values, ttl, stale_ttl, policy)
+
+        self._apply_invalidation(list(entries), [], namespaces)
+        if self.l1_enabled:
+            for key, entry in entries.items():
+                self.local.set(key, entry, hard_ttls[key])
+
+        return await redis_client.write_batch(
+            set_items=entries,
+            ttls=hard_ttls,
+            incr_keys=[self._namespace_version_key(namespace) for namespace in namespaces],
+            messages=self._invalidation_message(list(entries), [], namespaces)
+        )
+
+    def _invalidation_message(self, keys: list, prefixes: list, namespaces: list) -> Dict[str, Any]:
+        """Mensaje de pub/sub para que las demás réplicas invaliden su L1"""
+        if not self.l1_enabled:
+            return {}
+        return {self.channel: {"keys": keys, "prefixes": prefixes, "namespaces": namespaces}}
+
+    async def invalidate(
+        self,
+        keys: Iterable[str] = (),
+        prefixes: Iterable[str] = (),
+        namespaces: Iterable[str] = ()
+    ):
+        """
+        Invalida claves, prefijos y namespaces en Redis, en L1 local y en el L1
+        de las demás réplicas.
+
+        Claves, namespaces y el aviso a las réplicas van en un único MULTI/EXEC.
+        Los prefijos requieren SCAN y se procesan aparte (evitar en rutas calientes).
+
+        Args:
+            keys: Claves exactas a eliminar
+            prefixes: Prefijos de claves a eliminar con SCAN
+            namespaces: Namespaces cuya generación se incrementa con un INCR
+        """
+        keys = list(keys)
+        prefixes = list(prefixes)
+        namespaces = list(namespaces)
+
+        self._apply_invalidation(keys, prefixes, namespaces)
+
+        for prefix in prefixes:
+            await redis_client.delete_pattern(f"{prefix}*")
+
+        await redis_client.write_batch(
+            delete_keys=keys,
+            incr_keys=[self._namespace_version_key(namespace) for namespace in namespaces],
+            messages=self._invalidation_message(keys, prefixes, namespaces)
+        )
+
+    def _apply_invalidation(self, keys: list, prefixes: list, namespaces: list):
+        """Desaloja de L1 las claves, prefijos y namespaces indicados"""
+        if not self.l1_enabled:
+            return
+        self.local.delete(keys)
+        for prefix in prefixes:
+            self.local.delete_prefix(prefix)
+        for namespace in namespaces:
+            self.local.delete_prefix(f"{namespace}:")
+
+    async def _listen(self):
+        """Escucha invalidaciones de otras réplicas y las aplica en L1"""
+        while True:
+            pubsub = redis_client.pubsub()
+            if pubsub is None:
+                await asyncio.sleep(1)
+                continue
+
+            try:
+                await pubsub.subscribe(self.channel)
+                # Pudimos perder mensajes mientras no estábamos suscritos
+                self.local.clear()
+                logger.info(f"📡 Suscrito a invalidaciones en '{self.channel}'")
+
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        data = json.loads(message["data"])
+                        self._apply_invalidation(
+                            data.get("keys", []),
+                            data.get("prefixes", []),
+                            data.get("namespaces", [])
+                        )
+                    except (ValueError, TypeError) as e:
+                        logger.error(f"Mensaje de invalidación inválido: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Listener de invalidaciones interrumpido: {e}")
+                # Sin invalidaciones remotas, L1 podría quedar obsoleta
+                self.local.clear()
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def get_stats(self) -> dict:
+        """Devuelve las estadísticas de ambos niveles por separado"""
+        l2_total = self.l2_hits + self.l2_misses
+        return {
+            "l1": {"enabled": self.l1_enabled, **self.local.get_stats()},
+            "l2": {
+                "hits": self.l2_hits,
+                "misses": self.l2_misses,
+                "hit_ratio": round(self.l2_hits / l2_total, 4) if l2_total else 0.0
+            },
+            "single_flight": {
+                "in_flight": len(self._inflight),
+                "coalesced": self.coalesced,
+                "lock_waits": self.lock_waits
+            },
+            "negative_hits": self.negative_hits,
+            "refresh": {
+                "stale_serves": self.stale_serves,
+                "early_refreshes": self.early_refreshes,
+                "errors": self.refresh_errors,
+                "in_background": len(self._refresh_tasks)
+            }
+        }
+
+
+# Instancia global de la caché de dos niveles
+tiered_cache = TieredCache()
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 import os
 
 
@@ -15,12 +15,83 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     DB_ECHO: bool = True
+    DB_RUN_MIGRATIONS: bool = True  # False si las migraciones corren como paso de despliegue (alembic upgrade head)
+    # Sin filtros y con al menos esta cantidad de filas (según pg_class), el total
+    # del listado se estima en lugar de contarse
+    DB_ESTIMATE_TOTAL_MIN_ROWS: int = 10_000
+
+    # Réplica de lectura (vacío = todas las consultas van al primario)
+    DATABASE_REPLICA_URL: str = ""
+    DB_READ_AFTER_WRITE_WINDOW: float = 5.0  # Segundos que las lecturas van al primario tras una escritura
+    DB_REPLICA_MAX_LAG: float = 5.0          # Con más retraso (segundos) se lee del primario
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = 5.0
     
     # Redis
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 1.0           # Espera máxima por una conexión libre del pool (segundos)
+    REDIS_SOCKET_TIMEOUT: float = 5.0
+    REDIS_BREAKER_THRESHOLD: int = 5          # Fallos consecutivos para abrir el circuito
+    REDIS_RECONNECT_MIN_DELAY: float = 0.5    # Backoff inicial de reconexión (segundos)
+    REDIS_RECONNECT_MAX_DELAY: float = 30.0   # Backoff máximo de reconexión (segundos)
+
+    # Codec de valores en caché (json, orjson, msgpack) y compresión (none, zlib, lz4)
+    CACHE_CODEC: str = "msgpack"
+    CACHE_COMPRESSION: str = "zlib"
+    CACHE_COMPRESSION_MIN_SIZE: int = 1024   # Solo se comprimen valores más grandes (bytes)
+
+    # Caché L1 (en memoria del proceso, delante de Redis)
+    CACHE_L1_ENABLED: bool = False
+    CACHE_L1_MAX_SIZE: int = 1000
+    CACHE_L1_TTL: float = 5.0
+    CACHE_INVALIDATION_CHANNEL: str = "tournaments:cache:invalidate"
+
+    # Single-flight: lock distribuido para recargar claves expiradas
+    CACHE_LOCK_TTL: float = 5.0            # Duración máxima del lock (segundos)
+    CACHE_LOCK_POLL_INTERVAL: float = 0.05 # Intervalo de espera de otras réplicas (segundos)
+
+    # Stale-while-revalidate y recarga anticipada (XFetch)
+    CACHE_STALE_TTL: int = 60              # Segundos que se sirve un valor vencido mientras se recarga
+    CACHE_XFETCH_ENABLED: bool = False
+    CACHE_XFETCH_BETA: float = 1.0         # >1 adelanta más las recargas
+
+    # TTL (segundos) por familia de claves y estado del torneo.
+    # Los estados no listados usan el TTL por defecto de la familia.
+    CACHE_TTL_POLICY: Dict[str, Dict[str, int]] = {
+        "tournament": {
+            "completed": 86400,
+            "cancelled": 86400,
+            "pending": 300,
+            "registration": 30,
+            "in_progress": 15,
+        },
+        "tournament:list": {
+            "completed": 3600,
+            "cancelled": 3600,
+            "pending": 60,
+            "registration": 15,
+            "in_progress": 10,
+        },
+    }
+
+    # Caché negativo y filtro de Bloom de IDs existentes
+    CACHE_NEGATIVE_TTL: int = 30           # Segundos que se recuerda un ID inexistente
+    CACHE_BLOOM_ENABLED: bool = False
+    CACHE_BLOOM_CAPACITY: int = 1_000_000
+    CACHE_BLOOM_ERROR_RATE: float = 0.01
+    CACHE_BLOOM_CHECK_INTERVAL: float = 60.0    # Cada cuánto se verifica que el filtro esté poblado
+    CACHE_BLOOM_REBUILD_INTERVAL: int = 3600    # Reconstrucción completa (cubre bits perdidos)
+
+    # Precarga del caché al iniciar (evita el pico en la base de datos tras un deploy)
+    CACHE_WARMUP_ENABLED: bool = False
+    CACHE_WARMUP_TOURNAMENTS: int = 200    # Torneos recientes o en curso a precargar
+    CACHE_WARMUP_LIST_PAGES: int = 3       # Primeras páginas del listado sin filtros
+    CACHE_WARMUP_PAGE_SIZE: int = 10       # Igual al page_size por defecto del endpoint
+    CACHE_WARMUP_CONCURRENCY: int = 4
+    CACHE_WARMUP_DEADLINE: float = 10.0    # Segundos máximos que se retrasa el arranque
     
     # RabbitMQ
     RABBITMQ_HOST: str = "localhost"
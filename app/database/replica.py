@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database.session import ReplicaSessionLocal, SessionLocal, engine, replica_engine
+
+logger = logging.getLogger(__name__)
+
+# Segundos de retraso de la réplica: 0 si ya aplicó todo lo recibido
+# (una réplica al día sin escrituras recientes no cuenta como atrasada)
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaRouter:
+    """
+    Decide si una lectura va a la réplica o al primario.
+
+    Las lecturas van al primario si:
+    - no hay réplica configurada
+    - hubo una escritura en este proceso hace menos de DB_READ_AFTER_WRITE_WINDOW
+      (leer lo que uno mismo acaba de escribir)
+    - el retraso medido supera DB_REPLICA_MAX_LAG o no se pudo medir
+
+    Lo leído llena el caché compartido: la ventana tras una escritura evita
+    que las listas (que cada escritura invalida) y las recargas en background
+    se vuelvan a llenar desde una réplica que aún no aplicó esa escritura.
+    """
+
+    def __init__(self):
+        """Inicializa el router (la medición del retraso se arranca con start())"""
+        self.enabled = replica_engine is not None
+        self.pin_window = settings.DB_READ_AFTER_WRITE_WINDOW
+        self.max_lag = settings.DB_REPLICA_MAX_LAG
+        self.check_interval = settings.DB_REPLICA_LAG_CHECK_INTERVAL
+
+        self.lag: Optional[float] = None
+        self.lag_checked_at: Optional[float] = None
+        self._last_write = 0.0
+        self._monitor_task: Optional[asyncio.Task] = None
+
+        # Estadísticas
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.pinned_reads = 0
+        self.lag_fallbacks = 0
+
+    async def start(self):
+        """Arranca la medición periódica del retraso si hay réplica"""
+        if self.enabled and self._monitor_task is None:
+            await self.check_lag()
+            self._monitor_task = asyncio.create_task(self._monitor())
+            logger.info(f"📖 Réplica de lectura habilitada (retraso máx. {self.max_lag}s)")
+
+    async def stop(self):
+        """Detiene la medición del retraso"""
+        if self._monitor_task:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+
+    async def _monitor(self):
+        """Mide el retraso de la réplica cada DB_REPLICA_LAG_CHECK_INTERVAL segundos"""
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check_lag()
+
+    async def check_lag(self) -> Optional[float]:
+        """
+        Mide el retraso de replicación. Si la réplica no responde el retraso
+        queda como desconocido y las lecturas van al primario.
+        """
+        try:
+            async with replica_engine.connect() as conn:
+                lag = (await conn.execute(REPLICA_LAG_QUERY)).scalar()
+            self.lag = float(lag)
+        except Exception as e:
+            if self.lag is not None:
+                logger.warning(f"⚠️ No se pudo medir el retraso de la réplica - leyendo del primario: {e}")
+            self.lag = None
+        self.lag_checked_at = time.time()
+        return self.lag
+
+    def mark_write(self):
+        """Registra una escritura: las lecturas siguientes van al primario durante la ventana"""
+        self._last_write = time.monotonic()
+
+    def is_pinned(self) -> bool:
+        """True si hubo una escritura dentro de la ventana de lectura tras escritura"""
+        return time.monotonic() - self._last_write < self.pin_window
+
+    def use_replica(self) -> bool:
+        """Decide el destino de una lectura y actualiza las estadísticas"""
+        if not self.enabled:
+            self.primary_reads += 1
+            return False
+        if self.is_pinned():
+            self.pinned_reads += 1
+            self.primary_reads += 1
+            return False
+        if self.lag is None or self.lag > self.max_lag:
+            self.lag_fallbacks += 1
+            self.primary_reads += 1
+            return False
+        self.replica_reads += 1
+        return True
+
+    def session_factory(self) -> async_sessionmaker:
+        """Fábrica de sesiones para una lectura: réplica o primario"""
+        return ReplicaSessionLocal if self.use_replica() else SessionLocal
+
+    @staticmethod
+    def is_replica(session: AsyncSession) -> bool:
+        """
+        True si la sesión lee de la réplica. Lo que no se encontró ahí
+        puede existir en el primario (aún no replicado): no debe quedar
+        como entrada negativa en el caché sin confirmarlo en el primario.
+        """
+        return replica_engine is not None and session.bind is replica_engine
+
+    def get_stats(self) -> dict:
+        """Estado de la réplica y reparto de lecturas"""
+        return {
+            "enabled": self.enabled,
+            "lag_seconds": round(self.lag, 3) if self.lag is not None else None,
+            "lag_checked_at": self.lag_checked_at,
+            "max_lag_seconds": self.max_lag,
+            "healthy": self.enabled and self.lag is not None and self.lag <= self.max_lag,
+            "pinned_to_primary": self.is_pinned(),
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "pinned_reads": self.pinned_reads,
+            "lag_fallbacks": self.lag_fallbacks,
+        }
+
+
+class LazySession:
+    """
+    Sesión que se abre recién en el primer uso.
+
+    Los endpoints de lectura responden muchas veces desde el caché: así no se
+    crea la sesión ni se decide réplica o primario (ni se cuenta la lectura)
+    si no se llega a consultar la base de datos. La decisión se toma al
+    momento de la consulta, con el retraso y la ventana de escritura vigentes.
+    Delega todos los atributos a la AsyncSession real.
+    """
+
+    def __init__(self, get_factory: Callable[[], async_sessionmaker]):
+        self._get_factory = get_factory
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def is_open(self) -> bool:
+        """True si la sesión ya se abrió (hubo al menos un acceso)"""
+        return self._session is not None
+
+    def __getattr__(self, name: str):
+        if self._session is None:
+            self._session = self._get_factory()()
+        return getattr(self._session, name)
+
+    async def close(self):
+        """Cierra la sesión real si se llegó a abrir"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+# Instancia global del router
+replica_router = ReplicaRouter()
+
+
+@event.listens_for(engine.sync_engine, "commit")
+def _on_primary_commit(conn):
+    """Cualquier commit en el primario fija las lecturas al primario por un momento"""
+    replica_router.mark_write()
+
+
+async def get_read_db():
+    """
+    Dependency para endpoints de solo lectura (GET).
+    Usa la réplica salvo que el router indique leer del primario.
+    La sesión se abre al primer uso (ver LazySession): un request resuelto
+    desde el caché no la crea.
+    """
+    db = LazySession(replica_router.session_factory)
+    try:
+        yield db
+    finally:
+        await db.close()
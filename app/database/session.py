@@ -1,39 +1,97 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from pathlib import Path
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 from app.config import settings
 
-# Crear el engine de SQLAlchemy
-engine = create_engine(
-    settings.DATABASE_URL,
+# Configuración de Alembic (en la raíz del servicio)
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def async_database_url(url: str) -> str:
+    """Usa el driver asyncpg aunque DATABASE_URL indique psycopg2 o ningún driver"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+# Crear el engine asíncrono de SQLAlchemy (asyncpg)
+engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
     echo=settings.DB_ECHO,  # Muestra las queries SQL en consola
     pool_pre_ping=True,     # Verifica conexiones antes de usarlas
     pool_size=5,            # Número de conexiones en el pool
     max_overflow=10         # Conexiones adicionales si el pool está lleno
 )
 
-# Sesión local
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Engine de la réplica de lectura (None si no hay DATABASE_REPLICA_URL).
+# El enrutamiento de lecturas está en app/database/replica.py
+replica_engine = create_async_engine(
+    async_database_url(settings.DATABASE_REPLICA_URL),
+    echo=settings.DB_ECHO,
+    pool_pre_ping=True,
+    pool_size=5,
+    max_overflow=10
+) if settings.DATABASE_REPLICA_URL else None
+
+# Sesión local (AsyncSession). expire_on_commit=False: tras el commit los
+# atributos siguen cargados y no disparan lazy loads fuera del contexto async
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Sesiones de solo lectura sobre la réplica (o el primario si no hay réplica)
+ReplicaSessionLocal = async_sessionmaker(
+    bind=replica_engine or engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 # Base para los modelos
 Base = declarative_base()
 
 
-def get_db():
+async def get_db():
     """
-    Dependency para obtener una sesión de base de datos.
+    Dependency para obtener una sesión asíncrona de base de datos.
     Se usa en los endpoints de FastAPI.
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def init_db():
+def _run_migrations(connection):
+    """Aplica las migraciones de Alembic pendientes sobre una conexión síncrona"""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+
+async def init_db():
     """
-    Inicializa la base de datos creando todas las tablas.
-    Se llama al iniciar la aplicación.
+    Inicializa la base de datos aplicando las migraciones pendientes
+    (alembic upgrade head). Se llama al iniciar la aplicación.
+    Las bases creadas antes con create_all se adoptan sin recrear la tabla.
+    
+    Con DB_RUN_MIGRATIONS=false no migra: las migraciones corren como paso
+    de despliegue (`alembic upgrade head`) y no en el arranque de cada instancia.
     """
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    if not settings.DB_RUN_MIGRATIONS:
+        return
+    # Sin transacción abierta: alembic maneja una por migración
+    async with engine.connect() as conn:
+        await conn.run_sync(_run_migrations)
+
+
+async def close_db():
+    """Cierra las conexiones del pool. Se llama al cerrar la aplicación."""
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
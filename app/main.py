@@ -4,7 +4,7 @@ from contextlib import asynccontextmanager
 import logging
 
 from app.config import settings
-from app.database.session import init_db
+from app.database.session import init_db, close_db
 from app.api.v1 import tournaments
 
 # Configurar logging
@@ -27,18 +27,44 @@ async def lifespan(app: FastAPI):
     try:
         # Inicializar base de datos
         logger.info("📊 Conectando a PostgreSQL...")
-        init_db()
+        await init_db()
         logger.info("✅ Base de datos conectada")
+        # Medición del retraso de la réplica de lectura (si está configurada)
+        from app.database.replica import replica_router
+        await replica_router.start()
     except Exception as e:
         logger.error(f"❌ Error al conectar a la base de datos: {e}")
         raise
     
-    # Redis se conecta automáticamente al importar redis_client
+    # Conectar a Redis (cliente asíncrono con pool de conexiones)
     from app.cache.redis_client import redis_client
+    await redis_client.connect()
     if redis_client.is_connected():
         logger.info("✅ Redis conectado y listo")
     else:
         logger.warning("⚠️ Redis no disponible - continuando sin caché")
+
+    # Caché L1 e invalidaciones entre réplicas
+    from app.cache.tiered_cache import tiered_cache
+    await tiered_cache.start()
+
+    # Filtro de Bloom de IDs de torneos (se construye y reconstruye en background)
+    from app.cache.bloom_filter import tournament_bloom
+    bloom_task = None
+    if tournament_bloom.enabled:
+        import asyncio
+        from app.services.tournament_service import TournamentService
+        bloom_task = asyncio.create_task(TournamentService.maintain_bloom_filter())
+
+    # Precarga del caché: el arranque (readiness) espera hasta que termine
+    # o hasta el deadline; si se vence, la precarga sigue en background
+    if settings.CACHE_WARMUP_ENABLED and redis_client.is_connected():
+        import asyncio
+        from app.services.tournament_service import TournamentService
+        warmup_task = asyncio.create_task(TournamentService.warm_up_cache())
+        done, _ = await asyncio.wait({warmup_task}, timeout=settings.CACHE_WARMUP_DEADLINE)
+        if not done:
+            logger.warning(f"⚠️ Precarga del caché sin terminar tras {settings.CACHE_WARMUP_DEADLINE}s - continuando en background")
     
     # Conectar a RabbitMQ (Producer)
     from app.services.messaging_service import rabbitmq_service
@@ -65,9 +91,20 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("👋 Cerrando aplicación...")
 
-    # Cerrar conexión a Redis
+    # Detener el mantenimiento del filtro de Bloom
+    if bloom_task:
+        bloom_task.cancel()
+
+    # Cerrar caché L1 y conexión a Redis
+    from app.cache.tiered_cache import tiered_cache
+    await tiered_cache.stop()
     from app.cache.redis_client import redis_client
-    redis_client.close()
+    await redis_client.close()
+
+    # Cerrar el pool de conexiones a PostgreSQL (primario y réplica)
+    from app.database.replica import replica_router
+    await replica_router.stop()
+    await close_db()
 
     # Cerrar Consumer de RabbitMQ
     from app.services.match_consumer import match_consumer
@@ -128,26 +165,30 @@ async def health_check():
 async def database_health():
     """
     Verifica la conexión a la base de datos.
+    Incluye el estado de la réplica de lectura (retraso y reparto de lecturas).
     """
     from app.database.session import engine
+    from app.database.replica import replica_router
     from sqlalchemy import text
     
     try:
         # Intentar conectar y ejecutar query
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         
         return {
             "status": "healthy",
             "database": "PostgreSQL",
-            "connected": True
+            "connected": True,
+            "replica": replica_router.get_stats()
         }
     except Exception as e:
         return {
             "status": "unhealthy",
             "database": "PostgreSQL",
             "connected": False,
-            "error": str(e)
+            "error": str(e),
+            "replica": replica_router.get_stats()
         }
 
 
@@ -155,20 +196,51 @@ async def database_health():
 async def redis_health():
     """
     Verifica la conexión a Redis.
+    Reporta el estado del circuit breaker sin hacer PING en cada request.
     """
-    from app.cache.redis_client import redis_client
+    from app.cache.redis_client import redis_client, CircuitState
     
+    breaker = redis_client.get_status()
     is_connected = redis_client.is_connected()
     
     return {
-        "status": "healthy" if is_connected else "unhealthy",
+        "status": "unhealthy" if breaker["state"] == CircuitState.OPEN.value else breaker["state"],
         "service": "Redis",
         "connected": is_connected,
         "host": settings.REDIS_HOST,
-        "port": settings.REDIS_PORT
+        "port": settings.REDIS_PORT,
+        "circuit_breaker": breaker
     }
 
 
+@app.get("/health/cache")
+async def cache_stats():
+    """
+    Estadísticas de la caché de dos niveles (L1 en memoria y Redis).
+    """
+    from app.cache.tiered_cache import tiered_cache
+    from app.cache.bloom_filter import tournament_bloom
+    from app.cache.policy import CachePolicy
+    
+    return {
+        **tiered_cache.get_stats(),
+        "bloom_filter": tournament_bloom.get_stats(),
+        "policies": {family: policy.get_stats() for family, policy in CachePolicy.registry.items()}
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Métricas de caché para ajustar TTLs: aciertos, fallos, errores, desalojos
+    y valores vencidos servidos por familia de claves, y latencia de Redis
+    por operación.
+    """
+    from app.cache.metrics import cache_metrics
+    
+    return cache_metrics.get_stats()
+
+
 @app.get("/health/rabbitmq")
 async def rabbitmq_health():
     """
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, Index, Enum as SQLEnum, text
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 from datetime import datetime
 import enum
+import re
 
 from app.database.session import Base
 
@@ -21,6 +23,34 @@ class TournamentType(str, enum.Enum):
     TEAM = "team"                 # Torneo por equipos
 
 
+def slugify_game(game: str) -> str:
+    """Forma normalizada de un juego para búsquedas exactas (ej: "CS:GO" -> "cs-go")"""
+    return re.sub(r"[^a-z0-9]+", "-", game.lower()).strip("-")
+
+
+def tournament_to_dict(source) -> dict:
+    """
+    Convierte a diccionario un torneo o cualquier objeto con sus columnas como
+    atributos (ej: las filas de select(*columnas), sin instancia ORM)
+    """
+    return {
+        "id": source.id,
+        "name": source.name,
+        "game": source.game,
+        "description": source.description,
+        "max_participants": source.max_participants,
+        "current_participants": source.current_participants,
+        "tournament_type": source.tournament_type.value if source.tournament_type else None,
+        "status": source.status.value if source.status else None,
+        "registration_start": source.registration_start.isoformat() if source.registration_start else None,
+        "registration_end": source.registration_end.isoformat() if source.registration_end else None,
+        "tournament_start": source.tournament_start.isoformat() if source.tournament_start else None,
+        "tournament_end": source.tournament_end.isoformat() if source.tournament_end else None,
+        "created_at": source.created_at.isoformat() if source.created_at else None,
+        "updated_at": source.updated_at.isoformat() if source.updated_at else None,
+    }
+
+
 class Tournament(Base):
     """
     Modelo de Torneo.
@@ -32,7 +62,8 @@ class Tournament(Base):
     # Campos principales
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(200), nullable=False, index=True)
-    game = Column(String(100), nullable=False, index=True)  # Ej: "League of Legends", "CS:GO"
+    game = Column(String(100), nullable=False)  # Ej: "League of Legends", "CS:GO"
+    game_slug = Column(String(100), nullable=False)  # Ej: "league-of-legends", "cs-go"
     description = Column(String(1000), nullable=True)
     
     # Configuración del torneo
@@ -49,8 +80,7 @@ class Tournament(Base):
     status = Column(
         SQLEnum(TournamentStatus),
         nullable=False,
-        default=TournamentStatus.PENDING,
-        index=True
+        default=TournamentStatus.PENDING
     )
     
     # Timestamps
@@ -62,24 +92,43 @@ class Tournament(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
     
+    # Índices de las consultas frecuentes (creados por las migraciones de Alembic;
+    # ver tests/check_query_plans.py para verificar que el planner los usa)
+    __table_args__ = (
+        # Listado sin filtros y paginación por cursor (ORDER BY created_at DESC, id DESC)
+        Index("ix_tournaments_created_at_id", "created_at", "id"),
+        # Listado filtrado por estado
+        Index("ix_tournaments_status_created_at", status, created_at.desc(), id.desc()),
+        # Listado filtrado por juego exacto (y opcionalmente estado)
+        Index("ix_tournaments_game_slug_status_created_at", game_slug, status, created_at.desc(), id.desc()),
+        # Torneos activos (precarga del caché y listados de inscripción/en curso)
+        Index(
+            "ix_tournaments_active_created_at",
+            created_at.desc(),
+            id.desc(),
+            postgresql_where=text("status IN ('REGISTRATION', 'IN_PROGRESS')")
+        ),
+        # Búsqueda por subcadena de juego (ILIKE '%...%') con pg_trgm
+        Index(
+            "ix_tournaments_game_trgm",
+            "game",
+            postgresql_using="gin",
+            postgresql_ops={"game": "gin_trgm_ops"}
+        ),
+    )
+    
+    @validates("game")
+    def _sync_game_slug(self, key, game):
+        """
+        Mantiene game_slug al asignar el juego (al crear o actualizar).
+        En PostgreSQL además lo calcula un trigger (migración 0002).
+        """
+        self.game_slug = slugify_game(game)
+        return game
+    
     def __repr__(self):
         return f"<Tournament(id={self.id}, name='{self.name}', game='{self.game}', status='{self.status}')>"
     
     def to_dict(self):
         """Convierte el modelo a diccionario"""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "game": self.game,
-            "description": self.description,
-            "max_participants": self.max_participants,
-            "current_participants": self.current_participants,
-            "tournament_type": self.tournament_type.value if self.tournament_type else None,
-            "status": self.status.value if self.status else None,
-            "registration_start": self.registration_start.isoformat() if self.registration_start else None,
-            "registration_end": self.registration_end.isoformat() if self.registration_end else None,
-            "tournament_start": self.tournament_start.isoformat() if self.tournament_start else None,
-            "tournament_end": self.tournament_end.isoformat() if self.tournament_end else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
\ No newline at end of file
+        return tournament_to_dict(self)
\ No newline at end of file
@@ -60,12 +60,45 @@ class TournamentResponse(TournamentBase):
 
 
 class TournamentListResponse(BaseModel):
-    """Schema para listar torneos con paginación"""
+    """
+    Schema para listar torneos con paginación.
+    total y total_pages solo se calculan si se piden (include_total) y nunca
+    en modo cursor; total_exact indica si son exactos o estimados.
+    """
     tournaments: list[TournamentResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    total_exact: Optional[bool] = Field(None, description="False si total y total_pages son estimados")
+    next_cursor: Optional[str] = Field(None, description="Cursor de la página siguiente (None si es la última)")
+
+
+class TournamentBatchItem(BaseModel):
+    """Resultado de un ID dentro de una consulta por lotes"""
+    id: int
+    found: bool
+    tournament: Optional[TournamentResponse] = None
+
+
+class TournamentBatchResponse(BaseModel):
+    """Schema para consultar varios torneos por ID (en el orden solicitado)"""
+    tournaments: list[TournamentBatchItem]
+
+
+class TournamentBulkItem(BaseModel):
+    """Resultado de un elemento de una creación masiva (en el orden recibido)"""
+    index: int
+    created: bool
+    tournament: Optional[TournamentResponse] = None
+    errors: Optional[list[str]] = None
+
+
+class TournamentBulkResponse(BaseModel):
+    """Schema para la creación masiva de torneos"""
+    created: int
+    failed: int
+    results: list[TournamentBulkItem]
 
 
 class StartTournamentRequest(BaseModel):
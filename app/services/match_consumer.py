@@ -107,9 +107,8 @@ class MatchConsumer:
                 from app.models.tournament import Tournament
                 from app.services.bracket_service import BracketService
 
-                db = SessionLocal()
-                try:
-                    tournament = db.query(Tournament).filter(Tournament.id == tournament_id).first()
+                async with SessionLocal() as db:
+                    tournament = await db.get(Tournament, tournament_id)
                     if tournament:
                         # Calcular el número total de rondas basado en participantes
                         total_rounds = BracketService.calculate_rounds(tournament.current_participants or tournament.max_participants)
@@ -118,8 +117,6 @@ class MatchConsumer:
                             logger.info(f"🏆 ¡TORNEO FINALIZADO! Ganador del torneo: {winner_id}")
                             logger.info(f"📊 Ronda {round_number} era la final (total rondas: {total_rounds})")
                             return  # No crear más matches, el torneo terminó
-                finally:
-                    db.close()
 
             # Avanzar al ganador a la siguiente ronda
             from app.services.bracket_service import BracketService
@@ -1,7 +1,8 @@
 import aio_pika
+import asyncio
 import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -120,6 +121,67 @@ class RabbitMQService:
             event_type="TOURNAMENT_CREATED"
         )
     
+    async def publish_events(
+        self,
+        routing_key: str,
+        events: List[Dict[str, Any]],
+        event_type: str
+    ) -> int:
+        """
+        Publica varios eventos con la misma clave de enrutamiento.
+        Un mensaje por evento, pero publicados en paralelo: las confirmaciones
+        del broker se esperan juntas en lugar de una tras otra.
+        
+        Args:
+            routing_key: Clave de enrutamiento (ej: "tournament.created")
+            events: Datos de cada evento
+            event_type: Tipo de evento
+            
+        Returns:
+            int: Cantidad de eventos publicados correctamente
+        """
+        if not events:
+            return 0
+        if not self.is_connected():
+            logger.warning(f"⚠️ RabbitMQ no conectado. {len(events)} eventos no publicados: {routing_key}")
+            return 0
+        
+        async def publish(event_data: Dict[str, Any]) -> bool:
+            message = aio_pika.Message(
+                body=json.dumps(
+                    {"event_type": event_type, "routing_key": routing_key, "data": event_data},
+                    default=str
+                ).encode(),
+                content_type="application/json",
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT
+            )
+            try:
+                await self.exchange.publish(message, routing_key=routing_key)
+                return True
+            except Exception as e:
+                logger.error(f"❌ Error al publicar evento {routing_key}: {e}")
+                return False
+        
+        published = sum(await asyncio.gather(*(publish(event_data) for event_data in events)))
+        logger.info(f"📤 {published}/{len(events)} eventos publicados: {routing_key}")
+        return published
+    
+    async def publish_tournaments_created(self, tournaments_data: List[Dict[str, Any]]) -> int:
+        """
+        Publica un evento de torneo creado por cada torneo de una creación masiva.
+        
+        Args:
+            tournaments_data: Datos de los torneos creados
+            
+        Returns:
+            int: Cantidad de eventos publicados correctamente
+        """
+        return await self.publish_events(
+            routing_key="tournament.created",
+            events=tournaments_data,
+            event_type="TOURNAMENT_CREATED"
+        )
+    
     async def publish_tournament_updated(self, tournament_data: Dict[str, Any]) -> bool:
         """
         Publica un evento de torneo actualizado.
@@ -1,12 +1,23 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Optional, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, insert, select, text, tuple_, update
+from typing import Optional, List, Iterable, Callable, Awaitable, Any
+from datetime import datetime, timedelta
 from fastapi import HTTPException, status
+import asyncio
+import base64
+import binascii
+import json
 import logging
+import re
 
-from app.models.tournament import Tournament, TournamentStatus
+from app.models.tournament import Tournament, TournamentStatus, slugify_game, tournament_to_dict
 from app.schemas.tournament import TournamentCreate, TournamentUpdate
-from app.cache.redis_client import redis_client
+from app.cache.tiered_cache import tiered_cache
+from app.cache.bloom_filter import tournament_bloom
+from app.cache.policy import CachePolicy
+from app.database.replica import replica_router
+from app.database.session import SessionLocal
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +28,28 @@ class TournamentService:
     # Constantes para claves de caché
     CACHE_PREFIX = "tournament"
     CACHE_TTL = 300  # 5 minutos
+    CACHE_LIST_NAMESPACE = f"{CACHE_PREFIX}:list"
+    CACHE_LIST_TTL = 60  # 1 minuto
+    
+    # Políticas de TTL según el estado (ver CACHE_TTL_POLICY): los torneos
+    # finalizados casi no cambian; los que están en curso se invalidan por eventos
+    CACHE_POLICY = CachePolicy(
+        family=CACHE_PREFIX,
+        default_ttl=CACHE_TTL,
+        status_of=lambda tournament: tournament.get("status")
+    )
+    LIST_CACHE_POLICY = CachePolicy(
+        family=CACHE_LIST_NAMESPACE,
+        default_ttl=CACHE_LIST_TTL,
+        status_of=lambda page: page.get("status_filter")
+    )
+    BLOOM_BUILD_BATCH_SIZE = 5000
+    BLOOM_BUILD_OVERLAP = 60  # Segundos antes del inicio de la construcción que se vuelven a agregar
+    WARMUP_BATCH_SIZE = 100
+    
+    # Columnas de las lecturas de listado y por lotes: se leen como filas (tuplas),
+    # sin instancias ORM ni identity map, y se convierten con tournament_to_dict
+    LIST_COLUMNS = tuple(column for column in Tournament.__table__.columns if column.key != "game_slug")
     
     @staticmethod
     def _get_cache_key(tournament_id: int) -> str:
@@ -24,25 +57,232 @@ class TournamentService:
         return f"{TournamentService.CACHE_PREFIX}:{tournament_id}"
     
     @staticmethod
-    def _invalidate_cache(tournament_id: Optional[int] = None):
+    def _get_list_cache_suffix(
+        skip: int,
+        limit: int,
+        game: Optional[str],
+        status_filter: Optional[TournamentStatus],
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        game_exact: bool = False
+    ) -> str:
+        """
+        Genera la parte variable (canónica) de la clave de caché de una lista.
+        El filtro de juego es case-insensitive (ILIKE), así que se normaliza.
+        """
+        if game and game_exact:
+            game_key = f"slug:{slugify_game(game)}"
+        else:
+            game_key = game.lower() if game else ""
+        status_key = status_filter.value if status_filter else ""
+        position = f"cursor={cursor}" if cursor else f"skip={skip}:total={int(include_total)}"
+        return f"{position}:limit={limit}:game={game_key}:status={status_key}"
+    
+    @staticmethod
+    def encode_cursor(tournament: dict) -> str:
+        """
+        Genera el cursor opaco que apunta después de un torneo del listado.
+        La clave de búsqueda es (created_at, id), igual que el orden del listado.
         """
-        Invalida el caché de torneos.
+        payload = json.dumps([tournament["created_at"], tournament["id"]], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[datetime, int]:
+        """
+        Decodifica un cursor generado por encode_cursor.
+        
+        Raises:
+            HTTPException: Si el cursor no es válido
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, tournament_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), int(tournament_id)
+        except (binascii.Error, ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor de paginación inválido"
+            )
+    
+    @staticmethod
+    def _with_own_session(
+        load: Callable[[AsyncSession], Awaitable[Any]]
+    ) -> Callable[[], Awaitable[Any]]:
+        """
+        Adapta un loader para recargas de caché en background.
+        La sesión del request ya estará cerrada, así que se abre una propia
+        (en la réplica de lectura si el router lo permite).
+        """
+        async def run() -> Any:
+            async with replica_router.session_factory()() as db:
+                return await load(db)
+        return run
+    
+    @staticmethod
+    async def _invalidate_cache(tournament_ids: Iterable[int] = (), include_lists: bool = True):
+        """
+        Invalida el caché de torneos en un solo round trip a Redis.
         
         Args:
-            tournament_id: Si se especifica, solo invalida ese torneo.
-                          Si es None, invalida todo el caché de torneos.
+            tournament_ids: Torneos cuya entrada individual se elimina
+            include_lists: Si es True, invalida también todas las listas
+                          (un INCR de la generación del namespace)
         """
-        if tournament_id:
-            cache_key = TournamentService._get_cache_key(tournament_id)
-            redis_client.delete(cache_key)
-            logger.info(f"🗑️ Caché invalidado para torneo {tournament_id}")
-        else:
-            # Invalidar todas las listas de torneos
-            redis_client.delete_pattern(f"{TournamentService.CACHE_PREFIX}:list:*")
-            logger.info(f"🗑️ Caché de listas de torneos invalidado")
+        tournament_ids = list(tournament_ids)
+        namespaces = [TournamentService.CACHE_LIST_NAMESPACE] if include_lists else []
+        
+        await tiered_cache.invalidate(
+            keys=[TournamentService._get_cache_key(tournament_id) for tournament_id in tournament_ids],
+            namespaces=namespaces
+        )
+        logger.debug(f"🗑️ Caché invalidado (torneos: {tournament_ids}, listas: {include_lists})")
+    
+    @staticmethod
+    async def build_bloom_filter(force: bool = False):
+        """
+        Puebla el filtro de Bloom con los IDs existentes si no está listo
+        (o siempre, con force). Solo una réplica lo construye (lock en Redis).
+        
+        Se construye en una clave temporal que luego reemplaza al filtro actual
+        (RENAME), así el filtro vigente sigue respondiendo mientras tanto. Los IDs
+        creados durante la construcción se vuelven a agregar tras el reemplazo.
+        """
+        if not tournament_bloom.enabled:
+            return
+        if not force and not tournament_bloom.unreliable and await tournament_bloom.is_ready():
+            return
+        
+        import uuid
+        from app.cache.redis_client import redis_client
+        
+        lock_key = f"lock:{tournament_bloom.key}"
+        token = uuid.uuid4().hex
+        if not await redis_client.acquire_lock(lock_key, token, ttl=600):
+            return
+        
+        build_key = tournament_bloom.build_key(token)
+        try:
+            total = 0
+            started_at = datetime.now().astimezone()
+            # Del primario: un ID que aún no llegó a la réplica quedaría
+            # fuera del filtro y se respondería 404
+            async with SessionLocal() as db:
+                result = await db.stream_scalars(
+                    select(Tournament.id).execution_options(yield_per=TournamentService.BLOOM_BUILD_BATCH_SIZE)
+                )
+                async for batch in result.partitions():
+                    if not await tournament_bloom.add_many_to(build_key, batch):
+                        raise ConnectionError("Redis no disponible")
+                    total += len(batch)
+            
+            if not await tournament_bloom.publish_build(build_key):
+                raise ConnectionError("no se pudo reemplazar el filtro")
+            
+            # Los creados mientras tanto pudieron agregarse solo al filtro anterior
+            async with SessionLocal() as db:
+                recent_ids = list(await db.scalars(
+                    select(Tournament.id).where(
+                        Tournament.created_at >= started_at - timedelta(seconds=TournamentService.BLOOM_BUILD_OVERLAP)
+                    )
+                ))
+            await tournament_bloom.add_many(recent_ids)
+            
+            await redis_client.set(
+                f"{tournament_bloom.key}:built",
+                started_at.isoformat(),
+                ttl=settings.CACHE_BLOOM_REBUILD_INTERVAL
+            )
+            logger.info(f"🌸 Filtro de Bloom de torneos construido ({total} IDs)")
+        except Exception as e:
+            logger.error(f"❌ Error al construir el filtro de Bloom: {e}")
+            await redis_client.delete(build_key)
+        finally:
+            await redis_client.release_lock(lock_key, token)
+    
+    @staticmethod
+    async def maintain_bloom_filter():
+        """
+        Mantiene el filtro de Bloom en background: lo construye si no está
+        poblado (al arrancar, tras un add fallido o si se perdió la clave) y lo
+        reconstruye por completo cada CACHE_BLOOM_REBUILD_INTERVAL segundos.
+        """
+        from app.cache.redis_client import redis_client
+        
+        while True:
+            try:
+                if tournament_bloom.unreliable:
+                    await tournament_bloom.invalidate()
+                rebuild_due = await redis_client.get(f"{tournament_bloom.key}:built") is None
+                await TournamentService.build_bloom_filter(force=rebuild_due)
+            except Exception as e:
+                logger.error(f"❌ Error al verificar el filtro de Bloom: {e}")
+            await asyncio.sleep(settings.CACHE_BLOOM_CHECK_INTERVAL)
+    
+    @staticmethod
+    async def warm_up_cache():
+        """
+        Precarga en caché los torneos más consultados tras un arranque en frío:
+        los que están en curso o en inscripción, los más recientes y las primeras
+        páginas del listado (sin filtro y por cada estado activo).
+        
+        Las cargas corren con concurrencia acotada, cada una con su propia sesión.
+        Las entradas que otra réplica ya dejó en Redis no vuelven a la base de datos.
+        """
+        hot_statuses = [TournamentStatus.IN_PROGRESS, TournamentStatus.REGISTRATION]
+        page_size = settings.CACHE_WARMUP_PAGE_SIZE
+        semaphore = asyncio.Semaphore(settings.CACHE_WARMUP_CONCURRENCY)
+        
+        recent = select(Tournament.id).order_by(Tournament.created_at.desc()).limit(settings.CACHE_WARMUP_TOURNAMENTS)
+        async with replica_router.session_factory()() as db:
+            active_ids = list(await db.scalars(recent.where(Tournament.status.in_(hot_statuses))))
+            recent_ids = list(await db.scalars(recent))
+        
+        tournament_ids = list(dict.fromkeys(active_ids + recent_ids))[:settings.CACHE_WARMUP_TOURNAMENTS]
+        pages = [(page * page_size, None) for page in range(settings.CACHE_WARMUP_LIST_PAGES)]
+        pages += [(0, status_filter) for status_filter in hot_statuses]
+        
+        async def warm(load: Callable[[AsyncSession], Awaitable[Any]]):
+            async with semaphore:
+                try:
+                    await TournamentService._with_own_session(load)()
+                except Exception as e:
+                    logger.warning(f"⚠️ Error en la precarga del caché: {e}")
+        
+        batch_size = TournamentService.WARMUP_BATCH_SIZE
+        batches = [tournament_ids[i:i + batch_size] for i in range(0, len(tournament_ids), batch_size)]
+        loads = [
+            lambda session, ids=ids: TournamentService.get_tournaments_batch(session, ids)
+            for ids in batches
+        ] + [
+            lambda session, skip=skip, status_filter=status_filter: TournamentService.get_tournaments_cached(
+                session, skip=skip, limit=page_size, status_filter=status_filter
+            )
+            for skip, status_filter in pages
+        ]
+        
+        await asyncio.gather(*(warm(load) for load in loads))
+        logger.info(f"🔥 Caché precargado ({len(tournament_ids)} torneos, {len(pages)} páginas)")
+    
+    @staticmethod
+    async def _write_through_cache(tournament_dict: dict):
+        """
+        Guarda el estado actualizado del torneo en caché e invalida las listas
+        en la misma transacción de Redis, evitando el miss tras una escritura.
+        
+        Args:
+            tournament_dict: Torneo ya persistido (después del commit), como diccionario
+        """
+        await tiered_cache.write_through(
+            {TournamentService._get_cache_key(tournament_dict["id"]): tournament_dict},
+            ttl=TournamentService.CACHE_TTL,
+            namespaces=[TournamentService.CACHE_LIST_NAMESPACE],
+            policy=TournamentService.CACHE_POLICY
+        )
+        logger.debug(f"💾 Caché actualizado para torneo {tournament_dict['id']}")
     
     @staticmethod
-    def create_tournament(db: Session, tournament_data: TournamentCreate) -> Tournament:
+    async def create_tournament(db: AsyncSession, tournament_data: TournamentCreate) -> Tournament:
         """
         Crea un nuevo torneo.
         
@@ -68,20 +308,21 @@ class TournamentService:
             current_participants=0
         )
         
-        # Guardar en la base de datos
+        # Guardar en la base de datos (id y created_at vuelven en el RETURNING del INSERT,
+        # no hace falta refresh)
         db.add(tournament)
-        db.commit()
-        db.refresh(tournament)
+        await db.commit()
         
-        # Invalidar caché de listas
-        TournamentService._invalidate_cache()
+        # Registrar el ID, descartar una posible entrada negativa previa e invalidar listas
+        await tournament_bloom.add(tournament.id)
+        await TournamentService._invalidate_cache([tournament.id])
         
         logger.info(f"✅ Torneo creado: {tournament.name} (ID: {tournament.id})")
         
         return tournament
     
     @staticmethod
-    async def create_tournament_async(db: Session, tournament_data: TournamentCreate) -> Tournament:
+    async def create_tournament_async(db: AsyncSession, tournament_data: TournamentCreate) -> Tournament:
         """
         Crea un nuevo torneo y publica evento.
         
@@ -93,7 +334,7 @@ class TournamentService:
             Tournament: Torneo creado
         """
         # Crear el torneo
-        tournament = TournamentService.create_tournament(db, tournament_data)
+        tournament = await TournamentService.create_tournament(db, tournament_data)
         
         # Publicar evento
         from app.services.messaging_service import rabbitmq_service
@@ -103,7 +344,75 @@ class TournamentService:
         return tournament
     
     @staticmethod
-    def get_tournament_by_id(db: Session, tournament_id: int) -> Tournament:
+    async def create_tournaments_bulk(
+        db: AsyncSession,
+        tournaments_data: List[TournamentCreate]
+    ) -> List[Tournament]:
+        """
+        Crea varios torneos con un INSERT multi-fila (... RETURNING) y un solo commit.
+        El caché se invalida una vez para todo el lote.
+        
+        Args:
+            db: Sesión de base de datos
+            tournaments_data: Datos de los torneos a crear (ya validados)
+            
+        Returns:
+            List[Tournament]: Torneos creados, en el mismo orden
+        """
+        if not tournaments_data:
+            return []
+        
+        # El INSERT masivo no pasa por @validates: game_slug se calcula aquí
+        rows = [
+            {
+                **tournament_data.model_dump(),
+                "game_slug": slugify_game(tournament_data.game),
+                "status": TournamentStatus.REGISTRATION,
+                "current_participants": 0
+            }
+            for tournament_data in tournaments_data
+        ]
+        
+        result = await db.scalars(
+            insert(Tournament).returning(Tournament, sort_by_parameter_order=True),
+            rows
+        )
+        tournaments = list(result)
+        await db.commit()
+        
+        tournament_ids = [tournament.id for tournament in tournaments]
+        await tournament_bloom.add_many(tournament_ids)
+        await TournamentService._invalidate_cache(tournament_ids)
+        
+        logger.info(f"✅ {len(tournaments)} torneos creados en lote")
+        
+        return tournaments
+    
+    @staticmethod
+    async def create_tournaments_bulk_async(
+        db: AsyncSession,
+        tournaments_data: List[TournamentCreate]
+    ) -> List[Tournament]:
+        """
+        Crea varios torneos y publica sus eventos en un solo lote.
+        
+        Args:
+            db: Sesión de base de datos
+            tournaments_data: Datos de los torneos a crear (ya validados)
+            
+        Returns:
+            List[Tournament]: Torneos creados, en el mismo orden
+        """
+        tournaments = await TournamentService.create_tournaments_bulk(db, tournaments_data)
+        
+        # Publicar eventos
+        from app.services.messaging_service import rabbitmq_service
+        await rabbitmq_service.publish_tournaments_created([tournament.to_dict() for tournament in tournaments])
+        
+        return tournaments
+    
+    @staticmethod
+    async def get_tournament_by_id(db: AsyncSession, tournament_id: int) -> Tournament:
         """
         Obtiene un torneo por su ID.
         
@@ -118,23 +427,34 @@ class TournamentService:
             HTTPException: Si no se encuentra el torneo
         """
         # Consultar la base de datos (necesario para operaciones de escritura)
-        tournament = db.query(Tournament).filter(Tournament.id == tournament_id).first()
+        tournament = await db.get(Tournament, tournament_id)
         
         if not tournament:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Torneo con ID {tournament_id} no encontrado"
-            )
+            raise TournamentService._not_found(tournament_id)
         
         return tournament
     
     @staticmethod
-    def get_tournament_cached(db: Session, tournament_id: int) -> dict:
+    def _not_found(tournament_id: int) -> HTTPException:
+        """Error 404 para un torneo inexistente"""
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Torneo con ID {tournament_id} no encontrado"
+        )
+    
+    @staticmethod
+    async def get_tournament_cached(db: AsyncSession, tournament_id: int) -> dict:
         """
         Obtiene un torneo por su ID usando caché cuando es posible.
         Retorna un diccionario (no el objeto SQLAlchemy).
         Ideal para endpoints de solo lectura.
         
+        Ante un miss, solo una consulta por torneo llega a la base de datos
+        (single-flight); los demás requests reciben su resultado. Los torneos
+        vencidos se sirven del caché mientras se recargan en background.
+        Los IDs inexistentes se descartan con el filtro de Bloom o quedan en
+        caché negativo, así que no llegan repetidamente a la base de datos.
+        
         Args:
             db: Sesión de base de datos
             tournament_id: ID del torneo
@@ -145,76 +465,342 @@ class TournamentService:
         Raises:
             HTTPException: Si no se encuentra el torneo
         """
-        # Intentar obtener del caché
         cache_key = TournamentService._get_cache_key(tournament_id)
-        cached_data = redis_client.get(cache_key)
-        
-        if cached_data:
-            logger.info(f"📦 Torneo {tournament_id} obtenido del caché")
-            return cached_data
         
-        # Si no está en caché, consultar la base de datos
-        tournament = db.query(Tournament).filter(Tournament.id == tournament_id).first()
+        async def load_tournament(session: AsyncSession) -> Optional[dict]:
+            # Solo ante un miss: el filtro de Bloom evita la consulta si el ID
+            # seguro no existe (queda como entrada negativa)
+            if not await tournament_bloom.might_contain(tournament_id):
+                return None
+            
+            # Si no está en caché, consultar la base de datos
+            tournament = await session.get(Tournament, tournament_id)
+            
+            if not tournament and replica_router.is_replica(session):
+                # Puede no haberse replicado aún: la entrada negativa solo se
+                # guarda si el primario confirma que no existe
+                async with SessionLocal() as primary:
+                    tournament = await primary.get(Tournament, tournament_id)
+            
+            if not tournament:
+                return None
+            
+            logger.debug(f"💾 Torneo {tournament_id} guardado en caché")
+            return tournament.to_dict()
         
-        if not tournament:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Torneo con ID {tournament_id} no encontrado"
-            )
+        tournament_dict = await tiered_cache.get_or_load(
+            cache_key,
+            lambda: load_tournament(db),
+            ttl=TournamentService.CACHE_TTL,
+            refresh_loader=TournamentService._with_own_session(load_tournament),
+            negative_ttl=settings.CACHE_NEGATIVE_TTL,
+            policy=TournamentService.CACHE_POLICY
+        )
         
-        # Guardar en caché para futuras consultas
-        tournament_dict = tournament.to_dict()
-        redis_client.set(cache_key, tournament_dict, ttl=TournamentService.CACHE_TTL)
-        logger.info(f"💾 Torneo {tournament_id} guardado en caché")
+        if tournament_dict is None:
+            raise TournamentService._not_found(tournament_id)
         
         return tournament_dict
     
     @staticmethod
-    def get_tournaments(
-        db: Session,
+    async def get_tournaments(
+        db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         game: Optional[str] = None,
-        status_filter: Optional[TournamentStatus] = None
-    ) -> tuple[List[Tournament], int]:
+        status_filter: Optional[TournamentStatus] = None,
+        game_exact: bool = False,
+        include_total: bool = False
+    ) -> tuple[List[dict], Optional[int], bool, bool]:
         """
         Obtiene una lista de torneos con filtros opcionales.
         
+        El total es opcional. Si se pide, sin filtros y con una tabla grande se
+        usa la estimación de pg_class; en otro caso se cuenta con COUNT(*) OVER ()
+        en la misma consulta de la página.
+        
         Args:
             db: Sesión de base de datos
             skip: Número de registros a saltar (paginación)
             limit: Número máximo de registros a retornar
             game: Filtrar por juego
             status_filter: Filtrar por estado
+            game_exact: Si es True, game debe coincidir con el juego (normalizado)
+            include_total: Si es True, calcula el total de registros
             
         Returns:
-            tuple: (Lista de torneos, Total de registros)
+            tuple: (Lista de torneos como diccionarios, Total de registros o None,
+                    Si el total es exacto, Si hay más páginas)
+        """
+        query = TournamentService._filtered_query(game, status_filter, game_exact)
+        
+        # Ordenar por fecha de creación (id desempata) y pedir un registro extra
+        # para saber si hay una página siguiente sin contar
+        page_query = query.order_by(Tournament.created_at.desc(), Tournament.id.desc()).offset(skip).limit(limit + 1)
+        
+        total = None
+        total_exact = True
+        if include_total and not (game or status_filter):
+            total = await TournamentService._estimate_total(db)
+            total_exact = total is None
+        
+        if include_total and total is None:
+            rows = (await db.execute(page_query.add_columns(func.count().over().label("total")))).all()
+            if rows:
+                total = rows[0].total
+            else:
+                # Página fuera de rango: la ventana no devuelve filas
+                total = await db.scalar(select(func.count()).select_from(query.subquery())) if skip else 0
+        else:
+            rows = (await db.execute(page_query)).all()
+        
+        tournaments = [tournament_to_dict(row) for row in rows[:limit]]
+        return tournaments, total, total_exact, len(rows) > limit
+    
+    @staticmethod
+    async def _estimate_total(db: AsyncSession) -> Optional[int]:
+        """
+        Estimación del total de torneos según las estadísticas de PostgreSQL.
+        Retorna None si no aplica (otra base de datos, tabla chica o sin ANALYZE).
+        """
+        if db.bind.dialect.name != "postgresql":
+            return None
+        
+        estimate = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": Tournament.__tablename__}
+        )
+        if estimate is None or estimate < settings.DB_ESTIMATE_TOTAL_MIN_ROWS:
+            return None
+        return estimate
+    
+    @staticmethod
+    def _filtered_query(
+        game: Optional[str],
+        status_filter: Optional[TournamentStatus],
+        game_exact: bool = False
+    ):
+        """
+        Consulta base del listado (LIST_COLUMNS) con los filtros opcionales aplicados.
+        
+        El filtro de juego usa la forma que puede resolver un índice:
+        igualdad sobre game_slug (B-tree) si es exacto, o ILIKE '%...%' sobre
+        game (GIN pg_trgm, a partir de 3 caracteres) si es por subcadena.
         """
-        query = db.query(Tournament)
+        query = select(*TournamentService.LIST_COLUMNS)
         
-        # Aplicar filtros
-        if game:
-            query = query.filter(Tournament.game.ilike(f"%{game}%"))
+        if game and game_exact:
+            query = query.where(Tournament.game_slug == slugify_game(game))
+        elif game:
+            # Los comodines que escriba el usuario se buscan literalmente
+            pattern = re.sub(r"([\\%_])", r"\\\1", game)
+            query = query.where(Tournament.game.ilike(f"%{pattern}%", escape="\\"))
         
         if status_filter:
-            query = query.filter(Tournament.status == status_filter)
+            query = query.where(Tournament.status == status_filter)
+        
+        return query
+    
+    @staticmethod
+    async def get_tournaments_after(
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        game: Optional[str] = None,
+        status_filter: Optional[TournamentStatus] = None,
+        game_exact: bool = False
+    ) -> tuple[List[dict], bool]:
+        """
+        Obtiene una página del listado por cursor (keyset pagination).
+        
+        En lugar de OFFSET busca directamente la posición (created_at, id) del
+        cursor en el índice ix_tournaments_created_at_id, así que todas las
+        páginas cuestan lo mismo y no se desplazan al crearse torneos nuevos.
+        No cuenta el total.
+        
+        Args:
+            db: Sesión de base de datos
+            cursor: Cursor de la página anterior (None para la primera)
+            limit: Número máximo de registros a retornar
+            game: Filtrar por juego
+            status_filter: Filtrar por estado
+            game_exact: Si es True, game debe coincidir con el juego (normalizado)
+            
+        Returns:
+            tuple: (Lista de torneos como diccionarios, Si hay más páginas)
+        """
+        query = TournamentService._filtered_query(game, status_filter, game_exact)
+        
+        if cursor:
+            created_at, tournament_id = TournamentService.decode_cursor(cursor)
+            query = query.where(tuple_(Tournament.created_at, Tournament.id) < tuple_(created_at, tournament_id))
+        
+        # Un registro extra indica si existe una página siguiente
+        rows = (await db.execute(
+            query.order_by(Tournament.created_at.desc(), Tournament.id.desc()).limit(limit + 1)
+        )).all()
+        
+        return [tournament_to_dict(row) for row in rows[:limit]], len(rows) > limit
+    
+    @staticmethod
+    async def get_tournaments_batch(db: AsyncSession, tournament_ids: List[int]) -> List[Optional[dict]]:
+        """
+        Obtiene varios torneos por ID con un MGET al caché y una sola consulta
+        `WHERE id IN (...)` para los que falten. Los encontrados en la base de datos
+        se guardan en caché con un pipeline.
+        
+        Args:
+            db: Sesión de base de datos
+            tournament_ids: IDs de los torneos (pueden repetirse)
+            
+        Returns:
+            List: Datos de cada torneo en el orden solicitado (None si no existe)
+        """
+        unique_ids = list(dict.fromkeys(tournament_ids))
+        cache_keys = {
+            tournament_id: TournamentService._get_cache_key(tournament_id)
+            for tournament_id in unique_ids
+        }
+        
+        cached = await tiered_cache.get_many(list(cache_keys.values()))
+        found = {
+            tournament_id: cached[cache_key]
+            for tournament_id, cache_key in cache_keys.items()
+            if cache_key in cached
+        }
+        for data in found.values():
+            if data is not None:
+                TournamentService.CACHE_POLICY.record(data, hit=True)
+        
+        # El filtro de Bloom solo se consulta para los que no estaban en caché
+        missing_ids = [tournament_id for tournament_id in unique_ids if tournament_id not in found]
+        if missing_ids:
+            candidates = await tournament_bloom.might_contain_many(missing_ids)
+            missing_ids = [tournament_id for tournament_id in missing_ids if candidates[tournament_id]]
+        if missing_ids:
+            rows = await db.execute(
+                select(*TournamentService.LIST_COLUMNS).where(Tournament.id.in_(missing_ids))
+            )
+            loaded = {row.id: tournament_to_dict(row) for row in rows}
+            
+            # Los que faltan en la réplica se confirman en el primario antes de
+            # guardarlos como entradas negativas
+            absent_ids = [tournament_id for tournament_id in missing_ids if tournament_id not in loaded]
+            if absent_ids and replica_router.is_replica(db):
+                async with SessionLocal() as primary:
+                    rows = await primary.execute(
+                        select(*TournamentService.LIST_COLUMNS).where(Tournament.id.in_(absent_ids))
+                    )
+                    loaded.update((row.id, tournament_to_dict(row)) for row in rows)
+            
+            await tiered_cache.set_many(
+                {cache_keys[tournament_id]: data for tournament_id, data in loaded.items()},
+                ttl=TournamentService.CACHE_TTL,
+                policy=TournamentService.CACHE_POLICY
+            )
+            # Entradas negativas para los IDs que no existen
+            await tiered_cache.set_many(
+                {cache_keys[tournament_id]: None for tournament_id in missing_ids if tournament_id not in loaded},
+                ttl=settings.CACHE_NEGATIVE_TTL,
+                stale_ttl=0
+            )
+            for data in loaded.values():
+                TournamentService.CACHE_POLICY.record(data, hit=False)
+            found.update(loaded)
+        
+        return [found.get(tournament_id) for tournament_id in tournament_ids]
+    
+    @staticmethod
+    async def get_tournaments_cached(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        game: Optional[str] = None,
+        status_filter: Optional[TournamentStatus] = None,
+        game_exact: bool = False,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> tuple[List[dict], Optional[int], bool, Optional[str]]:
+        """
+        Obtiene una lista de torneos usando caché cuando es posible.
+        Las entradas se invalidan al crear, actualizar, cambiar de estado o eliminar torneos.
+        
+        Con cursor se pagina por keyset (ver get_tournaments_after) y se ignoran
+        skip e include_total.
+        
+        Args:
+            db: Sesión de base de datos
+            skip: Número de registros a saltar (paginación)
+            limit: Número máximo de registros a retornar
+            game: Filtrar por juego
+            status_filter: Filtrar por estado
+            game_exact: Si es True, game debe coincidir con el juego (normalizado)
+            cursor: Cursor de paginación (next_cursor de la página anterior)
+            include_total: Si es True, calcula el total (ver get_tournaments)
+            
+        Returns:
+            tuple: (Lista de torneos como diccionarios, Total de registros o None,
+                    Si el total es exacto, Cursor de la página siguiente o None)
+        """
+        if cursor:
+            # Validar antes de tocar el caché
+            TournamentService.decode_cursor(cursor)
         
-        # Contar total
-        total = query.count()
+        cache_key = await tiered_cache.namespaced_key(
+            TournamentService.CACHE_LIST_NAMESPACE,
+            TournamentService._get_list_cache_suffix(
+                skip, limit, game, status_filter, cursor, include_total, game_exact
+            )
+        )
+        
+        async def load_page(session: AsyncSession) -> dict:
+            if cursor:
+                tournaments, has_more = await TournamentService.get_tournaments_after(
+                    db=session,
+                    cursor=cursor,
+                    limit=limit,
+                    game=game,
+                    status_filter=status_filter,
+                    game_exact=game_exact
+                )
+                total, total_exact = None, True
+            else:
+                tournaments, total, total_exact, has_more = await TournamentService.get_tournaments(
+                    db=session,
+                    skip=skip,
+                    limit=limit,
+                    game=game,
+                    status_filter=status_filter,
+                    game_exact=game_exact,
+                    include_total=include_total
+                )
+            
+            return {
+                "tournaments": tournaments,
+                "total": total,
+                "total_exact": total_exact,
+                "next_cursor": TournamentService.encode_cursor(tournaments[-1]) if has_more and tournaments else None,
+                "status_filter": status_filter.value if status_filter else None
+            }
         
-        # Aplicar paginación y ordenar por fecha de creación
-        tournaments = query.order_by(Tournament.created_at.desc()).offset(skip).limit(limit).all()
+        page = await tiered_cache.get_or_load(
+            cache_key,
+            lambda: load_page(db),
+            ttl=TournamentService.CACHE_LIST_TTL,
+            refresh_loader=TournamentService._with_own_session(load_page),
+            policy=TournamentService.LIST_CACHE_POLICY
+        )
         
-        return tournaments, total
+        return page["tournaments"], page["total"], page.get("total_exact", True), page.get("next_cursor")
     
     @staticmethod
-    def update_tournament(
-        db: Session,
+    async def update_tournament(
+        db: AsyncSession,
         tournament_id: int,
         tournament_data: TournamentUpdate
     ) -> Tournament:
         """
-        Actualiza un torneo existente.
+        Actualiza un torneo existente con un solo UPDATE ... RETURNING.
         
         Args:
             db: Sesión de base de datos
@@ -224,20 +810,27 @@ class TournamentService:
         Returns:
             Tournament: Torneo actualizado
         """
-        tournament = TournamentService.get_tournament_by_id(db, tournament_id)
-        
         # Actualizar solo los campos que se enviaron
         update_data = tournament_data.model_dump(exclude_unset=True)
+        if not update_data:
+            return await TournamentService.get_tournament_by_id(db, tournament_id)
         
-        for field, value in update_data.items():
-            setattr(tournament, field, value)
+        # El UPDATE no pasa por @validates: game_slug se calcula aquí
+        if update_data.get("game") is not None:
+            update_data["game_slug"] = slugify_game(update_data["game"])
         
-        db.commit()
-        db.refresh(tournament)
+        tournament = await db.scalar(
+            update(Tournament)
+            .where(Tournament.id == tournament_id)
+            .values(**update_data)
+            .returning(Tournament)
+        )
+        if tournament is None:
+            raise TournamentService._not_found(tournament_id)
+        await db.commit()
         
-        # Invalidar caché
-        TournamentService._invalidate_cache(tournament_id)
-        TournamentService._invalidate_cache()  # También invalida listas
+        # Actualizar caché (write-through) e invalidar listas
+        await TournamentService._write_through_cache(tournament.to_dict())
         
         logger.info(f"✏️ Torneo {tournament_id} actualizado")
         
@@ -245,7 +838,7 @@ class TournamentService:
     
     @staticmethod
     async def update_tournament_async(
-        db: Session,
+        db: AsyncSession,
         tournament_id: int,
         tournament_data: TournamentUpdate
     ) -> Tournament:
@@ -260,7 +853,7 @@ class TournamentService:
         Returns:
             Tournament: Torneo actualizado
         """
-        tournament = TournamentService.update_tournament(db, tournament_id, tournament_data)
+        tournament = await TournamentService.update_tournament(db, tournament_id, tournament_data)
         
         # Publicar evento
         from app.services.messaging_service import rabbitmq_service
@@ -270,7 +863,31 @@ class TournamentService:
         return tournament
     
     @staticmethod
-    def delete_tournament(db: Session, tournament_id: int) -> dict:
+    async def _delete_returning(db: AsyncSession, tournament_id: int) -> str:
+        """
+        Elimina un torneo con un solo DELETE ... RETURNING e invalida el caché.
+        
+        Returns:
+            str: Nombre del torneo eliminado
+        """
+        tournament_name = await db.scalar(
+            delete(Tournament)
+            .where(Tournament.id == tournament_id)
+            .returning(Tournament.name)
+        )
+        if tournament_name is None:
+            raise TournamentService._not_found(tournament_id)
+        await db.commit()
+        
+        # Invalidar caché
+        await TournamentService._invalidate_cache([tournament_id])  # También invalida listas
+        
+        logger.info(f"🗑️ Torneo {tournament_id} eliminado")
+        
+        return tournament_name
+    
+    @staticmethod
+    async def delete_tournament(db: AsyncSession, tournament_id: int) -> dict:
         """
         Elimina un torneo.
         
@@ -281,22 +898,11 @@ class TournamentService:
         Returns:
             dict: Mensaje de confirmación
         """
-        tournament = TournamentService.get_tournament_by_id(db, tournament_id)
-        tournament_name = tournament.name
-        
-        db.delete(tournament)
-        db.commit()
-        
-        # Invalidar caché
-        TournamentService._invalidate_cache(tournament_id)
-        TournamentService._invalidate_cache()  # También invalida listas
-        
-        logger.info(f"🗑️ Torneo {tournament_id} eliminado")
-        
+        tournament_name = await TournamentService._delete_returning(db, tournament_id)
         return {"message": f"Torneo '{tournament_name}' eliminado correctamente"}
     
     @staticmethod
-    async def delete_tournament_async(db: Session, tournament_id: int) -> dict:
+    async def delete_tournament_async(db: AsyncSession, tournament_id: int) -> dict:
         """
         Elimina un torneo y publica evento.
         
@@ -307,58 +913,78 @@ class TournamentService:
         Returns:
             dict: Mensaje de confirmación
         """
-        tournament = TournamentService.get_tournament_by_id(db, tournament_id)
-        tournament_name = tournament.name
-        tournament_id_value = tournament.id
-        
-        result = TournamentService.delete_tournament(db, tournament_id)
+        tournament_name = await TournamentService._delete_returning(db, tournament_id)
         
         # Publicar evento
         from app.services.messaging_service import rabbitmq_service
-        await rabbitmq_service.publish_tournament_deleted(tournament_id_value, tournament_name)
+        await rabbitmq_service.publish_tournament_deleted(tournament_id, tournament_name)
         
-        return result
+        return {"message": f"Torneo '{tournament_name}' eliminado correctamente"}
     
     @staticmethod
-    def change_status(
-        db: Session,
+    async def _update_status(
+        db: AsyncSession,
         tournament_id: int,
-        new_status: TournamentStatus
-    ) -> Tournament:
+        new_status: TournamentStatus,
+        current_participants: Optional[int] = None
+    ) -> tuple[dict, TournamentStatus]:
         """
-        Cambia el estado de un torneo.
+        Cambia el estado con un solo UPDATE ... RETURNING.
+        El estado anterior sale de un CTE que bloquea la fila (FOR UPDATE) y
+        vuelve en la misma respuesta, sin leer el torneo antes.
+        
+        El resultado se arma con las columnas del RETURNING y no con la
+        instancia ORM: si el torneo ya estaba cargado en la sesión (ej: al
+        iniciarlo), el identity map devolvería esa instancia con updated_at
+        desactualizado.
         
         Args:
             db: Sesión de base de datos
             tournament_id: ID del torneo
             new_status: Nuevo estado
+            current_participants: Si se indica, se actualiza en el mismo UPDATE
             
         Returns:
-            Tournament: Torneo actualizado
+            tuple: (torneo actualizado como diccionario, estado anterior)
         """
-        tournament = TournamentService.get_tournament_by_id(db, tournament_id)
-        old_status = tournament.status
-        tournament.status = new_status
+        previous = (
+            select(Tournament.id, Tournament.status.label("old_status"))
+            .where(Tournament.id == tournament_id)
+            .with_for_update()
+            .cte("previous")
+        )
+        values = {"status": new_status}
+        if current_participants is not None:
+            values["current_participants"] = current_participants
         
-        db.commit()
-        db.refresh(tournament)
+        row = (await db.execute(
+            update(Tournament)
+            .where(Tournament.id == previous.c.id)
+            .values(**values)
+            .returning(*TournamentService.LIST_COLUMNS, previous.c.old_status)
+        )).first()
+        if row is None:
+            raise TournamentService._not_found(tournament_id)
+        await db.commit()
         
-        # Invalidar caché
-        TournamentService._invalidate_cache(tournament_id)
-        TournamentService._invalidate_cache()  # También invalida listas
+        tournament_dict = tournament_to_dict(row)
+        old_status = row.old_status
+        
+        # Actualizar caché (write-through) e invalidar listas
+        await TournamentService._write_through_cache(tournament_dict)
         
         logger.info(f"🔄 Torneo {tournament_id} cambió de estado: {old_status} → {new_status}")
         
-        return tournament
+        return tournament_dict, old_status
     
     @staticmethod
-    async def change_status_async(
-        db: Session,
+    async def change_status(
+        db: AsyncSession,
         tournament_id: int,
         new_status: TournamentStatus
-    ) -> Tournament:
+    ) -> dict:
         """
-        Cambia el estado de un torneo y publica evento.
+        Cambia el estado de un torneo.
         
         Args:
             db: Sesión de base de datos
@@ -366,21 +992,41 @@ class TournamentService:
             new_status: Nuevo estado
             
         Returns:
-            Tournament: Torneo actualizado
+            dict: Torneo actualizado
         """
-        tournament = TournamentService.get_tournament_by_id(db, tournament_id)
-        old_status = tournament.status.value if tournament.status else None
+        tournament_dict, _ = await TournamentService._update_status(db, tournament_id, new_status)
+        return tournament_dict
+    
+    @staticmethod
+    async def change_status_async(
+        db: AsyncSession,
+        tournament_id: int,
+        new_status: TournamentStatus,
+        current_participants: Optional[int] = None
+    ) -> dict:
+        """
+        Cambia el estado de un torneo y publica evento.
         
-        tournament = TournamentService.change_status(db, tournament_id, new_status)
+        Args:
+            db: Sesión de base de datos
+            tournament_id: ID del torneo
+            new_status: Nuevo estado
+            current_participants: Si se indica, se actualiza junto con el estado
+            
+        Returns:
+            dict: Torneo actualizado
+        """
+        tournament_dict, old_status = await TournamentService._update_status(
+            db, tournament_id, new_status, current_participants
+        )
         
         # Publicar evento
         from app.services.messaging_service import rabbitmq_service
-        tournament_dict = tournament.to_dict()
         await rabbitmq_service.publish_tournament_status_changed(
             tournament_id, 
-            old_status, 
+            old_status.value if old_status else None, 
             new_status.value,
             tournament_dict
         )
         
-        return tournament
\ No newline at end of file
+        return tournament_dict
\ No newline at end of file
@@ -1,16 +1,21 @@
 const axios = require('axios');
 const config = require('../config');
 
+// Máximo de IDs por consulta que acepta /tournaments/batch
+const BATCH_SIZE = 100;
+
 class TournamentsAPI {
   constructor() {
     this.baseURL = `${config.services.tournaments}/api/v1/tournaments`;
   }
 
-  async getTournaments({ page = 1, page_size = 10, game, status }) {
+  async getTournaments({ page = 1, page_size = 10, game, status, cursor, include_total = false }) {
     try {
       const params = { page, page_size };
       if (game) params.game = game;
       if (status) params.status = status;
+      if (cursor) params.cursor = cursor;
+      if (include_total) params.include_total = true;
 
       const response = await axios.get(this.baseURL, { params });
       return response.data;
@@ -28,6 +33,25 @@ class TournamentsAPI {
     }
   }
 
+  // Varios torneos en una llamada a /batch (máx. BATCH_SIZE IDs por llamada).
+  // Retorna un torneo (o null si no existe) por cada ID, en el mismo orden.
+  async getTournamentsBatch(ids) {
+    try {
+      const chunks = [];
+      for (let i = 0; i < ids.length; i += BATCH_SIZE) {
+        chunks.push(ids.slice(i, i + BATCH_SIZE));
+      }
+      const responses = await Promise.all(
+        chunks.map((chunk) => axios.get(`${this.baseURL}/batch`, { params: { ids: chunk.join(',') } }))
+      );
+      return responses.flatMap((response) =>
+        response.data.tournaments.map((item) => (item.found ? item.tournament : null))
+      );
+    } catch (error) {
+      throw this.handleError(error);
+    }
+  }
+
   async createTournament(input) {
     try {
       const response = await axios.post(this.baseURL, input);
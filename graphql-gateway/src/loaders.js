@@ -0,0 +1,41 @@
+const tournamentsAPI = require('./datasources/tournaments');
+
+// Loader por request: junta los IDs pedidos durante el mismo ciclo del
+// event loop y los resuelve con una sola llamada a /tournaments/batch.
+// Cada ID se pide una vez por request aunque varios matches lo compartan.
+const createBatchLoader = (loadMany) => {
+  const cache = new Map();
+  let queue = [];
+
+  const dispatch = async () => {
+    const batch = queue;
+    queue = [];
+    try {
+      const values = await loadMany(batch.map(({ key }) => key));
+      batch.forEach(({ resolve }, index) => resolve(values[index] ?? null));
+    } catch (error) {
+      batch.forEach(({ key, reject }) => {
+        cache.delete(key);
+        reject(error);
+      });
+    }
+  };
+
+  return {
+    load(key) {
+      if (!cache.has(key)) {
+        cache.set(key, new Promise((resolve, reject) => {
+          if (queue.length === 0) setImmediate(dispatch);
+          queue.push({ key, resolve, reject });
+        }));
+      }
+      return cache.get(key);
+    },
+  };
+};
+
+const createLoaders = () => ({
+  tournaments: createBatchLoader((ids) => tournamentsAPI.getTournamentsBatch(ids)),
+});
+
+module.exports = { createBatchLoader, createLoaders };
@@ -1,14 +1,27 @@
 const tournamentsAPI = require('./datasources/tournaments');
 const matchesAPI = require('./datasources/matches');
 
+// true si la query selecciona alguno de los campos indicados (incluye fragments)
+const selectsAnyField = (info, fieldNames) => {
+  const visit = (selectionSet) => selectionSet.selections.some((selection) => {
+    if (selection.kind === 'Field') return fieldNames.includes(selection.name.value);
+    if (selection.kind === 'InlineFragment') return visit(selection.selectionSet);
+    if (selection.kind === 'FragmentSpread') return visit(info.fragments[selection.name.value].selectionSet);
+    return false;
+  });
+  return info.fieldNodes.some((node) => node.selectionSet && visit(node.selectionSet));
+};
+
 const resolvers = {
   // ========================================
   // QUERIES
   // ========================================
   Query: {
     // Tournaments
-    tournaments: async (_, { page, page_size, game, status }) => {
-      return await tournamentsAPI.getTournaments({ page, page_size, game, status });
+    tournaments: async (_, { page, page_size, game, status, cursor }, __, info) => {
+      // El total cuesta un COUNT en el servicio: se pide solo si la query lo usa
+      const include_total = selectsAnyField(info, ['total', 'total_pages', 'total_exact']);
+      return await tournamentsAPI.getTournaments({ page, page_size, game, status, cursor, include_total });
     },
 
     tournament: async (_, { id }) => {
@@ -126,10 +139,11 @@ const resolvers = {
   },
 
   Match: {
-    // Resolver para obtener el torneo de un match
-    tournament: async (match) => {
+    // Resolver para obtener el torneo de un match: los torneos de todos los
+    // matches de la respuesta se piden juntos (ver loaders.js)
+    tournament: async (match, _, { loaders }) => {
       try {
-        return await tournamentsAPI.getTournament(match.tournament_id);
+        return await loaders.tournaments.load(match.tournament_id);
       } catch (error) {
         console.error(`Error fetching tournament ${match.tournament_id}:`, error.message);
         return null;
@@ -47,12 +47,16 @@ const typeDefs = gql`
     matches: [Match!]
   }
 
+  # total y total_pages solo vienen si se seleccionan (el servicio los calcula
+  # a pedido) y nunca en modo cursor. total_exact es false si son estimados.
   type TournamentListResponse {
     tournaments: [Tournament!]!
-    total: Int!
-    page: Int!
+    total: Int
+    page: Int
     page_size: Int!
-    total_pages: Int!
+    total_pages: Int
+    total_exact: Boolean
+    next_cursor: String
   }
 
   type BracketMatch {
@@ -182,6 +186,7 @@ const typeDefs = gql`
       page_size: Int
       game: String
       status: TournamentStatus
+      cursor: String
     ): TournamentListResponse!
     
     tournament(id: Int!): Tournament!
@@ -7,6 +7,7 @@ const cors = require('cors');
 const config = require('./config');
 const typeDefs = require('./schema');
 const resolvers = require('./resolvers');
+const { createLoaders } = require('./loaders');
 
 async function startApolloServer() {
   const app = express();
@@ -42,6 +43,8 @@ async function startApolloServer() {
       context: async ({ req }) => ({
         // Aquí puedes agregar contexto, como autenticación
         token: req.headers.authorization || '',
+        // Loaders nuevos en cada request (su caché no se comparte entre requests)
+        loaders: createLoaders(),
       }),
     })
   );
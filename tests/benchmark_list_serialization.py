@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Compara el costo por fila del listado de torneos:
+
+- ORM: select(Tournament) -> instancias ORM -> TournamentListResponse construido
+  en el endpoint con las instancias (from_attributes) y vuelto a validar por
+  FastAPI (camino anterior)
+- Proyección: TournamentService.get_tournaments (select de columnas -> filas ->
+  tournament_to_dict) -> una sola validación de TournamentListResponse
+
+Mide CPU (tiempo por fila) y memoria asignada (pico de tracemalloc por página).
+Inserta los torneos de prueba en una transacción que se revierte al terminar.
+
+Uso (con la base migrada: alembic upgrade head):
+    DATABASE_URL=postgresql://... python tests/benchmark_list_serialization.py [filas] [repeticiones]
+"""
+
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.session import engine
+from app.models.tournament import Tournament, TournamentStatus, TournamentType, slugify_game
+from app.schemas.tournament import TournamentListResponse
+from app.services.tournament_service import TournamentService
+
+
+# Colores
+class C:
+    G = '\033[0;32m'  # Green
+    Y = '\033[1;33m'  # Yellow
+    R = '\033[0;31m'  # Red
+    B = '\033[0;34m'  # Blue
+    M = '\033[0;35m'  # Magenta
+    N = '\033[0m'     # Reset
+
+
+def sample_rows(count: int) -> list:
+    """Torneos de prueba con todos los campos cargados"""
+    now = datetime.now(timezone.utc)
+    games = ["League of Legends", "CS:GO", "Valorant", "Dota 2"]
+    return [
+        {
+            "name": f"Benchmark {i}",
+            "game": games[i % len(games)],
+            "game_slug": slugify_game(games[i % len(games)]),
+            "description": "Torneo de prueba del benchmark de listado",
+            "max_participants": 16,
+            "current_participants": i % 16,
+            "tournament_type": TournamentType.INDIVIDUAL,
+            "status": TournamentStatus.REGISTRATION,
+            "registration_start": now,
+            "registration_end": now + timedelta(days=7),
+            "tournament_start": now + timedelta(days=8),
+            "tournament_end": now + timedelta(days=9),
+            "created_at": now - timedelta(seconds=i),
+        }
+        for i in range(count)
+    ]
+
+
+async def orm_page(db: AsyncSession, limit: int) -> bytes:
+    """Camino anterior: instancias ORM validadas con from_attributes y doble validación de la respuesta"""
+    query = select(Tournament).order_by(Tournament.created_at.desc(), Tournament.id.desc()).limit(limit + 1)
+    tournaments = list(await db.scalars(query))
+    response = TournamentListResponse(
+        tournaments=tournaments[:limit],
+        page=1,
+        page_size=limit
+    )
+    # FastAPI vuelve a validar el modelo retornado contra response_model
+    return TournamentListResponse.model_validate(response.model_dump()).model_dump_json().encode()
+
+
+async def projection_page(db: AsyncSession, limit: int) -> bytes:
+    """Camino actual: columnas como filas y una sola validación"""
+    tournaments, _, _, _ = await TournamentService.get_tournaments(db, limit=limit)
+    payload = {"tournaments": tournaments, "page": 1, "page_size": limit}
+    return TournamentListResponse.model_validate(payload).model_dump_json().encode()
+
+
+async def measure(conn, load, limit: int, repeats: int) -> dict:
+    """Tiempo por fila (µs) y pico de memoria por página (KiB), con una sesión por página"""
+    # Calentamiento (caché de compilación de SQLAlchemy y de pydantic)
+    async with AsyncSession(bind=conn) as db:
+        body = await load(db, limit)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        async with AsyncSession(bind=conn) as db:
+            await load(db, limit)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    async with AsyncSession(bind=conn) as db:
+        await load(db, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "us_per_row": elapsed / (repeats * limit) * 1_000_000,
+        "peak_kib": peak / 1024,
+        "bytes": len(body),
+    }
+
+
+async def main() -> int:
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    print(f"\n{C.M}{'='*70}{C.N}")
+    print(f"{C.M}{'⏱️  BENCHMARK DEL LISTADO DE TORNEOS'.center(70)}{C.N}")
+    print(f"{C.M}{'='*70}{C.N}\n")
+    print(f"{C.B}ℹ️  Página de {limit} torneos, {repeats} repeticiones{C.N}\n")
+
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            await conn.execute(insert(Tournament), sample_rows(limit + 1))
+
+            orm = await measure(conn, orm_page, limit, repeats)
+            projection = await measure(conn, projection_page, limit, repeats)
+        finally:
+            await transaction.rollback()
+
+    await engine.dispose()
+
+    print(f"{'':<14}{'µs/fila':>12}{'pico KiB':>12}{'bytes':>10}")
+    for name, result in (("ORM", orm), ("Proyección", projection)):
+        print(f"{name:<14}{result['us_per_row']:>12.1f}{result['peak_kib']:>12.1f}{result['bytes']:>10}")
+
+    if orm["bytes"] != projection["bytes"]:
+        print(f"\n{C.R}❌ Las respuestas de ambos caminos no coinciden{C.N}\n")
+        return 1
+
+    speedup = orm["us_per_row"] / projection["us_per_row"]
+    memory = projection["peak_kib"] / orm["peak_kib"]
+    print(f"\n{C.G}✅ Proyección: {speedup:.2f}x más rápido, {memory:.0%} de la memoria del camino ORM{C.N}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(asyncio.run(main()))
+    except KeyboardInterrupt:
+        print(f"\n\n{C.Y}⚠️  Interrumpido por el usuario{C.N}\n")
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n{C.R}❌ Error: {str(e)}{C.N}\n")
+        sys.exit(1)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Verifica con EXPLAIN que las consultas frecuentes del servicio de torneos usan
+los índices creados por las migraciones (alembic/versions).
+
+Uso (con la base migrada: alembic upgrade head):
+    DATABASE_URL=postgresql://... python tests/check_query_plans.py
+
+Con pocas filas el planner prefiere un seq scan, así que se desactiva
+(enable_seqscan = off): lo que se verifica es que el índice puede resolver la
+consulta tal como la arma TournamentService.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import select, text, tuple_
+
+from app.database.session import engine
+from app.models.tournament import Tournament, TournamentStatus
+from app.services.tournament_service import TournamentService
+
+
+# Colores
+class C:
+    G = '\033[0;32m'  # Green
+    Y = '\033[1;33m'  # Yellow
+    R = '\033[0;31m'  # Red
+    M = '\033[0;35m'  # Magenta
+    N = '\033[0m'     # Reset
+
+
+def list_query(game=None, status_filter=None, game_exact=False, after=None, limit=10):
+    """Consulta de una página del listado, igual que get_tournaments / get_tournaments_after"""
+    query = TournamentService._filtered_query(game, status_filter, game_exact)
+    if after:
+        query = query.where(tuple_(Tournament.created_at, Tournament.id) < tuple_(*after))
+    return query.order_by(Tournament.created_at.desc(), Tournament.id.desc()).limit(limit + 1)
+
+
+# (descripción, consulta, índice esperado)
+CHECKS = [
+    ("Listado sin filtros", list_query(), "ix_tournaments_created_at_id"),
+    (
+        "Listado por cursor",
+        list_query(after=(datetime(2025, 1, 1, tzinfo=timezone.utc), 1000)),
+        "ix_tournaments_created_at_id"
+    ),
+    (
+        "Listado por estado",
+        list_query(status_filter=TournamentStatus.COMPLETED),
+        "ix_tournaments_status_created_at"
+    ),
+    (
+        "Listado por juego exacto",
+        list_query(game="League of Legends", game_exact=True),
+        "ix_tournaments_game_slug_status_created_at"
+    ),
+    (
+        "Listado por juego exacto y estado",
+        list_query(game="CS:GO", game_exact=True, status_filter=TournamentStatus.PENDING),
+        "ix_tournaments_game_slug_status_created_at"
+    ),
+    (
+        "Búsqueda por subcadena de juego",
+        list_query(game="legends"),
+        "ix_tournaments_game_trgm"
+    ),
+    (
+        "Torneos activos (precarga del caché)",
+        select(Tournament.id)
+        .where(Tournament.status.in_([TournamentStatus.IN_PROGRESS, TournamentStatus.REGISTRATION]))
+        .order_by(Tournament.created_at.desc())
+        .limit(200),
+        "ix_tournaments_active_created_at"
+    ),
+]
+
+
+def find_indexes(plan: dict) -> set:
+    """Nombres de los índices usados en cualquier nodo del plan"""
+    indexes = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        indexes |= find_indexes(child)
+    return indexes
+
+
+async def explain(conn, query) -> dict:
+    """Ejecuta EXPLAIN (FORMAT JSON) de una consulta y retorna el nodo raíz"""
+    compiled = query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def main() -> int:
+    print(f"\n{C.M}{'='*70}{C.N}")
+    print(f"{C.M}{'🔎 PLANES DE CONSULTA DE TORNEOS'.center(70)}{C.N}")
+    print(f"{C.M}{'='*70}{C.N}\n")
+
+    failures = 0
+    async with engine.connect() as conn:
+        await conn.execute(text("SET enable_seqscan = off"))
+
+        for description, query, expected_index in CHECKS:
+            indexes = find_indexes(await explain(conn, query))
+            if expected_index in indexes:
+                print(f"{C.G}✅ {description}: {expected_index}{C.N}")
+            else:
+                failures += 1
+                used = ", ".join(sorted(indexes)) or "ninguno"
+                print(f"{C.R}❌ {description}: se esperaba {expected_index}, usa: {used}{C.N}")
+
+    await engine.dispose()
+
+    print()
+    if failures:
+        print(f"{C.R}❌ {failures} consulta(s) no usan el índice esperado{C.N}\n")
+        return 1
+    print(f"{C.G}✅ Todas las consultas usan el índice esperado{C.N}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(asyncio.run(main()))
+    except KeyboardInterrupt:
+        print(f"\n\n{C.Y}⚠️  Interrumpido por el usuario{C.N}\n")
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n{C.R}❌ Error: {str(e)}{C.N}\n")
+        sys.exit(1)
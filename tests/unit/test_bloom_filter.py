@@ -0,0 +1,74 @@
+"""Filtro de Bloom de IDs (posiciones y bit de listo)"""
+import pytest
+
+from app.cache.bloom_filter import BloomFilter
+from app.cache.redis_client import redis_client
+
+
+@pytest.fixture
+def bloom(fake_redis):
+    return BloomFilter(key="test:bloom", capacity=1000, error_rate=0.01)
+
+
+def test_offsets_skip_the_ready_bit_and_are_deterministic(bloom):
+    for item in range(500):
+        offsets = bloom._offsets(item)
+        assert len(offsets) == bloom.num_hashes
+        assert all(1 <= offset <= bloom.size for offset in offsets)
+        assert offsets == bloom._offsets(item)
+
+
+async def test_not_ready_filter_never_rejects(bloom):
+    await bloom.add_many([1, 2, 3])
+
+    assert not await bloom.is_ready()
+    assert await bloom.might_contain_many([1, 99]) == {1: True, 99: True}
+
+
+async def test_ready_filter_keeps_added_and_rejects_most_absent(bloom, fake_redis):
+    key = bloom.build_key("t1")
+    assert await bloom.add_many_to(key, range(1, 501))
+    assert await bloom.publish_build(key)
+
+    assert await bloom.is_ready()
+    present = await bloom.might_contain_many(list(range(1, 501)))
+    assert all(present.values())
+
+    absent = await bloom.might_contain_many(list(range(10_001, 10_201)))
+    assert sum(absent.values()) <= 10
+    assert bloom.rejections == 200 - sum(absent.values())
+
+
+async def test_failed_add_clears_the_ready_bit(bloom, fake_redis, monkeypatch):
+    key = bloom.build_key("t1")
+    await bloom.add_many_to(key, [1])
+    await bloom.publish_build(key)
+
+    # Falla solo el SETBIT del add; el que apaga el bit de listo funciona
+    calls = []
+
+    async def fail_first(key, offsets, value=1):
+        calls.append(value)
+        if len(calls) == 1:
+            return False
+        return await fake_redis.set_bits(key, offsets, value)
+    monkeypatch.setattr(redis_client, "set_bits", fail_first)
+
+    assert not await bloom.add(2)
+
+    assert bloom.failed_adds == 1
+    assert not bloom.unreliable
+    assert not await bloom.is_ready()
+    assert await bloom.might_contain(12345)
+
+
+async def test_unreliable_when_redis_rejects_every_write(bloom, fake_redis):
+    key = bloom.build_key("t1")
+    await bloom.add_many_to(key, [1])
+    await bloom.publish_build(key)
+
+    fake_redis.fail_set_bits = True
+    assert not await bloom.add(2)
+
+    assert bloom.unreliable
+    assert await bloom.might_contain(12345)
@@ -0,0 +1,56 @@
+"""Formato de los valores en Redis (CacheSerializer)"""
+import json
+import zlib
+
+import pytest
+
+from app.cache.codecs import CODEC_IDS, COMPRESSION_IDS, CacheSerializer
+
+VALUE = {"id": 1, "name": "Torneo", "tags": ["a", "b"], "score": None}
+
+
+def test_json_round_trip_with_header():
+    data = CacheSerializer("json").dumps(VALUE)
+
+    assert data[0] == CODEC_IDS["json"]
+    assert data[1] == COMPRESSION_IDS["none"]
+    assert CacheSerializer("json").loads(data) == VALUE
+
+
+def test_compresses_only_from_the_minimum_size():
+    serializer = CacheSerializer("json", "zlib", compression_min_size=64)
+
+    small = serializer.dumps({"id": 1})
+    large = serializer.dumps({"text": "x" * 500})
+
+    assert small[1] == COMPRESSION_IDS["none"]
+    assert large[1] == COMPRESSION_IDS["zlib"]
+    assert zlib.decompress(large[2:]) == json.dumps({"text": "x" * 500}).encode()
+    assert serializer.loads(large) == {"text": "x" * 500}
+
+
+def test_reads_by_header_regardless_of_current_config():
+    written = CacheSerializer("json", "zlib", compression_min_size=0).dumps(VALUE)
+
+    assert CacheSerializer("json", "none").loads(written) == VALUE
+
+
+@pytest.mark.parametrize("legacy, expected", [
+    (json.dumps(VALUE).encode(), VALUE),
+    (b"[1, 2]", [1, 2]),
+    (b"3", 3),  # Contador escrito con INCR
+])
+def test_reads_legacy_plain_json(legacy, expected):
+    assert CacheSerializer("json").loads(legacy) == expected
+
+
+def test_empty_value_is_none():
+    assert CacheSerializer("json").loads(None) is None
+    assert CacheSerializer("json").loads(b"") is None
+
+
+def test_unknown_codec_or_compression_is_rejected():
+    with pytest.raises(ValueError):
+        CacheSerializer("pickle")
+    with pytest.raises(ValueError):
+        CacheSerializer("json", "brotli")
@@ -0,0 +1,23 @@
+"""Cursor de paginación del listado (encode_cursor / decode_cursor)"""
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.tournament_service import TournamentService
+
+
+def test_round_trip():
+    created_at = datetime(2025, 1, 20, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    cursor = TournamentService.encode_cursor({"created_at": created_at.isoformat(), "id": 42})
+
+    assert "=" not in cursor
+    assert TournamentService.decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "no-es-base64!", "WzFd", "eyJhIjoxfQ"])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        TournamentService.decode_cursor(cursor)
+
+    assert error.value.status_code == 400
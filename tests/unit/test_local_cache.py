@@ -0,0 +1,64 @@
+"""Caché L1 (LocalCache): LRU y TTL"""
+import pytest
+
+from app.cache import local_cache
+from app.cache.local_cache import LocalCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj controlado por la prueba en lugar de time.monotonic"""
+    now = [1000.0]
+    monkeypatch.setattr(local_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_evicts_least_recently_used():
+    evicted = []
+    cache = LocalCache(max_size=2, ttl=60, on_evict=evicted.append)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert evicted == ["b"]
+    assert cache.evictions == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = LocalCache(ttl=5)
+    cache.set("a", 1)
+
+    clock[0] += 4.9
+    assert cache.get("a") == 1
+    clock[0] += 0.2
+    assert cache.get("a") is None
+    assert cache.get_stats()["size"] == 0
+
+
+def test_ttl_is_capped_by_the_default(clock):
+    cache = LocalCache(ttl=5)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=600)
+
+    clock[0] += 2
+    assert cache.get("short") is None
+    clock[0] += 3.5
+    assert cache.get("long") is None
+
+
+def test_delete_and_delete_prefix():
+    cache = LocalCache(ttl=60)
+    for key in ("tournament:1", "tournament:2", "tournament:list:v1:x", "other"):
+        cache.set(key, key)
+
+    cache.delete(["tournament:1"])
+    cache.delete_prefix("tournament:list:")
+
+    assert cache.get("tournament:1") is None
+    assert cache.get("tournament:list:v1:x") is None
+    assert cache.get("tournament:2") == "tournament:2"
+    assert cache.get("other") == "other"
@@ -0,0 +1,90 @@
+"""Single-flight de TieredCache.get_or_load"""
+import asyncio
+
+import pytest
+
+from app.cache.tiered_cache import TieredCache
+
+
+@pytest.fixture
+def cache(fake_redis):
+    return TieredCache()
+
+
+class Loader:
+    """Loader que cuenta sus llamadas y espera a que la prueba lo libere"""
+
+    def __init__(self, value="valor", error=None):
+        self.value = value
+        self.error = error
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return self.value
+
+
+async def test_concurrent_misses_run_the_loader_once(cache):
+    loader = Loader()
+    tasks = [asyncio.create_task(cache.get_or_load("k", loader)) for _ in range(5)]
+    await asyncio.sleep(0)
+    loader.release.set()
+
+    assert await asyncio.gather(*tasks) == ["valor"] * 5
+    assert loader.calls == 1
+    assert cache.coalesced == 4
+    assert cache._inflight == {}
+
+
+async def test_hit_does_not_call_the_loader(cache):
+    loader = Loader()
+    loader.release.set()
+    await cache.get_or_load("k", loader)
+
+    assert await cache.get_or_load("k", loader) == "valor"
+    assert loader.calls == 1
+
+
+async def test_waiter_loads_again_when_the_leader_is_cancelled(cache):
+    blocked = Loader()
+    leader = asyncio.create_task(cache.get_or_load("k", blocked))
+    await asyncio.sleep(0)
+
+    retry = Loader("recargado")
+    retry.release.set()
+    waiter = asyncio.create_task(cache.get_or_load("k", retry))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    assert await waiter == "recargado"
+    assert retry.calls == 1
+    assert cache._inflight == {}
+
+
+async def test_loader_exception_reaches_every_waiter(cache):
+    loader = Loader(error=ValueError("fuente caída"))
+    tasks = [asyncio.create_task(cache.get_or_load("k", loader)) for _ in range(3)]
+    await asyncio.sleep(0)
+    loader.release.set()
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert loader.calls == 1
+    assert cache._inflight == {}
+
+
+async def test_missing_value_is_stored_as_negative_entry(cache):
+    loader = Loader(value=None)
+    loader.release.set()
+
+    assert await cache.get_or_load("k", loader, negative_ttl=30) is None
+    assert await cache.get_or_load("k", loader, negative_ttl=30) is None
+    assert loader.calls == 1
+    assert cache.negative_hits == 1